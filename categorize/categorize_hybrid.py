@@ -8,8 +8,11 @@
 # - Final tie-breaker avoids "Uncategorized" when a label has minimal evidence
 
 import re
-import mysql.connector
-from config.db_config import DB_CONFIG
+import time
+from db.connection import get_connection
+from db.body_store import load_body
+from db.work_queue import claim, release, not_leased_sql, purge_expired
+from db.canonical import store_category
 from transformers import pipeline
 
 # ---------------- SETTINGS ----------------
@@ -103,6 +106,12 @@ MAX_CHARS = 1200
 MODEL_NAME = "facebook/bart-large-mnli"
 UNCATEGORIZED_LABEL = "Uncategorized"
 DEBUG_SCORES = False  # set True to print scores
+LEASE_STAGE = "categorize_canonical"  # work_leases stage; item ids are canonical ids
+# Ids (of "{ids}") still uncategorized; claim() drops leases on the rest
+PENDING_SQL = (
+    "SELECT id FROM canonical_articles "
+    "WHERE id IN ({ids}) AND (category IS NULL OR category = '')"
+)
 # ----------------------------------------
 
 # --- Technical vs Policy regex (for biasing) ---
@@ -138,29 +147,33 @@ def clf():
 
 # DB helpers
 def get_conn():
-    return mysql.connector.connect(**DB_CONFIG)
-
-def fetch_batch(conn):
-    where = "WHERE (category IS NULL OR category='')" if ONLY_EMPTY_CATEGORY else ""
+    return get_connection()
+
+def fetch_batch(conn, after_id=0):
+    # Canonical articles, so each distinct article is classified once for all hubs.
+    # Keyset on id; rows leased by another categorizer are skipped.
+    where = """
+        AND (c.category IS NULL OR c.category='')
+        AND EXISTS (SELECT 1 FROM articles a WHERE a.canonical_id = c.id
+                    AND (a.category IS NULL OR a.category=''))
+    """ if ONLY_EMPTY_CATEGORY else ""
     sql = f"""
-      SELECT id, short_title, summary, content
-      FROM articles
-      {where}
-      ORDER BY id ASC
+      SELECT c.id, c.short_title, c.summary, c.body_article_id
+      FROM canonical_articles c
+      WHERE c.id > %s {where}
+        AND {not_leased_sql(LEASE_STAGE, "c.id")}
+      ORDER BY c.id ASC
       LIMIT %s
     """
     cur = conn.cursor(dictionary=True)
-    cur.execute(sql, (BATCH_SIZE,))
+    cur.execute(sql, (after_id, int(time.time()), BATCH_SIZE))
     rows = cur.fetchall()
     cur.close()
     return rows
 
-def update_category(conn, article_id, categories_str):
-    sql = "UPDATE articles SET category=%s WHERE id=%s"
-    cur = conn.cursor()
-    cur.execute(sql, (categories_str, article_id))
-    conn.commit()
-    cur.close()
+def update_category(conn, canonical_id, categories_str):
+    # Saved on the canonical article and copied to its hub rows
+    store_category(conn, canonical_id, categories_str, only_empty=ONLY_EMPTY_CATEGORY)
 
 # Compile whole-word keyword patterns
 def _compile_patterns():
@@ -256,6 +269,7 @@ def zero_shot_labels(text: str):
     return kept
 
 def categorize_text(title, summary, content):
+    # content may be a zero-arg callable; it's only called if pass 2 needs it
     # Pass 1: title + summary
     text_ts = build_text(title, summary, "")
     labels = keyword_labels(text_ts)
@@ -266,6 +280,8 @@ def categorize_text(title, summary, content):
         return labels
 
     # Pass 2: include content slice only if still empty
+    if callable(content):
+        content = content() if USE_CONTENT_IN_TEXT else ""
     text_all = build_text(title, summary, content)
     labels = keyword_labels(text_all)
     if labels:
@@ -275,15 +291,31 @@ def categorize_text(title, summary, content):
 def main():
     conn = get_conn()
     total = 0
+    last_id = 0
     try:
+        purge_expired(conn)   # forget leases that expired long ago
         while True:
-            rows = fetch_batch(conn)
+            rows = fetch_batch(conn, last_id)
             if not rows:
                 break
+            last_id = rows[-1]["id"]
+
+            # Only work on the rows this worker managed to lease
+            claimed = set(claim(
+                conn, LEASE_STAGE, [r["id"] for r in rows],
+                pending_sql=PENDING_SQL if ONLY_EMPTY_CATEGORY else None,
+            ))
             for r in rows:
-                cats = categorize_text(r.get("short_title"), r.get("summary"), r.get("content"))
+                if r["id"] not in claimed:
+                    continue
+                cats = categorize_text(
+                    r.get("short_title"),
+                    r.get("summary"),
+                    lambda: load_body(conn, r["body_article_id"]) if r["body_article_id"] else "",  # loaded only if needed
+                )
                 cats_str = ", ".join(cats) if cats else UNCATEGORIZED_LABEL
                 update_category(conn, r["id"], cats_str)
+                release(conn, LEASE_STAGE, [r["id"]])
                 total += 1
                 print(f"[{r['id']}] -> {cats_str}")
         print(f"\nDone. Updated {total} article(s).")
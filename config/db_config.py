@@ -12,3 +12,14 @@ DB_CONFIG = {
     'database': os.getenv('DB_NAME'),
     'port': int(os.getenv('DB_PORT', 3306))  # default to 3306 if not set
 }
+
+# Shared connection pool (db/connection.py)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))            # max 32 (mysql.connector limit)
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))      # seconds to wait for a free connection
+
+# Storage backend: "mysql" (default) or "sqlite" (single-node / tests, no server needed)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'pipeline.db')
+
+# Work leases (db/work_queue.py): how long a worker owns a claimed row
+WORK_LEASE_SECONDS = int(os.getenv('WORK_LEASE_SECONDS', 1800))
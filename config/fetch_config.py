@@ -0,0 +1,41 @@
+from dotenv import load_dotenv
+import os
+
+# Load .env variables
+load_dotenv()
+
+# Feed polling concurrency (STEP 1)
+FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', 16))       # feeds polled at once
+FETCH_PER_HOST_LIMIT = int(os.getenv('FETCH_PER_HOST_LIMIT', 2))   # feeds polled at once per host
+
+# Article page downloads (content_extractor)
+EXTRACT_MAX_WORKERS = int(os.getenv('EXTRACT_MAX_WORKERS', 8))    # pages downloaded at once per feed
+EXTRACT_TIMEOUT = int(os.getenv('EXTRACT_TIMEOUT', 10))            # seconds to connect / per read
+EXTRACT_DEADLINE = int(os.getenv('EXTRACT_DEADLINE', 30))          # seconds for a whole page download
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 32))              # keep-alive connections per host
+EXTRACT_BACKEND = os.getenv('EXTRACT_BACKEND', 'bs4')              # "bs4" or "lxml" (faster, same output)
+EXTRACT_MAX_BYTES = int(os.getenv('EXTRACT_MAX_BYTES', 3 * 1024 * 1024))  # per-page download cap
+EXTRACT_STOP_AFTER_ARTICLE = os.getenv('EXTRACT_STOP_AFTER_ARTICLE', '1') == '1'  # stop reading once the first <article> closes
+
+# On-disk page cache in front of fetch_full_article_text
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', '1') == '1'
+PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', '.cache/pages')
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 7 * 24 * 3600))      # seconds an entry stays valid
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', 512))          # LRU-evicted above this size
+
+# Use the feed's own content:encoded body instead of scraping when it looks complete
+USE_FEED_CONTENT = os.getenv('USE_FEED_CONTENT', '1') == '1'
+FEED_CONTENT_MIN_CHARS = int(os.getenv('FEED_CONTENT_MIN_CHARS', 1500))  # shorter bodies are treated as teasers
+
+# Articles are inserted as they stream out of extraction, this many rows at a time
+FETCH_INSERT_BATCH = int(os.getenv('FETCH_INSERT_BATCH', 10))
+
+# Adaptive polling scheduler (python main.py --daemon)
+POLL_MIN_INTERVAL = int(os.getenv('POLL_MIN_INTERVAL', 15 * 60))        # never poll a feed more often
+POLL_MAX_INTERVAL = int(os.getenv('POLL_MAX_INTERVAL', 24 * 3600))      # never poll a feed less often
+POLL_DEFAULT_INTERVAL = int(os.getenv('POLL_DEFAULT_INTERVAL', 3600))   # feeds with no history yet
+POLL_GAP_FACTOR = float(os.getenv('POLL_GAP_FACTOR', 0.5))              # poll at this fraction of the typical gap between posts
+POLL_BACKOFF = float(os.getenv('POLL_BACKOFF', 1.5))                    # interval growth when nothing new appeared
+POLL_JITTER = float(os.getenv('POLL_JITTER', 0.1))                      # +/- fraction of randomness per poll
+SCHEDULER_TICK = int(os.getenv('SCHEDULER_TICK', 30))                   # seconds between due-checks
+SCHEDULER_REFRESH = int(os.getenv('SCHEDULER_REFRESH', 15 * 60))        # reload the feed list this often
@@ -0,0 +1,29 @@
+from dotenv import load_dotenv
+import os
+
+# Load .env variables
+load_dotenv()
+
+# Summarizer (STEP 2)
+SUMMARY_PAGE_SIZE = int(os.getenv('SUMMARY_PAGE_SIZE', 20))   # articles read from the DB per page
+SUMMARY_BATCH_SIZE = int(os.getenv('SUMMARY_BATCH_SIZE', 8))  # chunks per model.generate call (1 = no batching)
+
+# Persistent summarizer service (python -m summarize.summarizer_service)
+SUMMARY_SERVICE_ADDRESS = os.getenv('SUMMARY_SERVICE_ADDRESS', '')               # host:port; empty = load the model in-process
+SUMMARY_SERVICE_AUTHKEY = os.getenv('SUMMARY_SERVICE_AUTHKEY', '')               # shared secret; empty = use the key file below
+SUMMARY_SERVICE_KEY_FILE = os.getenv('SUMMARY_SERVICE_KEY_FILE', '.cache/summarizer.key')  # random key written (0600) by the service when no secret is set
+
+# CPU inference profile
+SUMMARY_TORCH_THREADS = int(os.getenv('SUMMARY_TORCH_THREADS', 0))   # intra-op threads for torch; 0 = torch default
+SUMMARY_QUANTIZE = os.getenv('SUMMARY_QUANTIZE', 'none')            # 'none' (fp32) or 'int8' (dynamic quantization of Linear layers)
+
+# Inference backend
+SUMMARY_BACKEND = os.getenv('SUMMARY_BACKEND', 'torch')           # 'torch' (eager PyTorch) or 'onnx' (ONNX Runtime, needs optimum[onnxruntime])
+ONNX_MODEL_DIR = os.getenv('ONNX_MODEL_DIR', '.cache/onnx')       # exported ONNX models are kept here and reused
+
+# Chunking (summarize/chunking.py)
+SUMMARY_TOKEN_BUDGET = int(os.getenv('SUMMARY_TOKEN_BUDGET', 2 * (1024 - 1)))   # max article tokens sent to the model: 2 chunks of 1023 + EOS
+SUMMARY_EXTRACTIVE = os.getenv('SUMMARY_EXTRACTIVE', '1') == '1'     # 1 = keep the most salient sentences (TF-IDF), 0 = keep the leading ones
+
+# Multi-process summarization (summarize/summarize_pool.py)
+SUMMARY_WORKERS = int(os.getenv('SUMMARY_WORKERS', 1))   # processes, each with its own model; 1 = summarize in-process
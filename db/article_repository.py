@@ -1,29 +1,26 @@
-import mysql.connector
-from config.db_config import DB_CONFIG
+from db.connection import get_connection, DB_ERRORS
+from db.canonical import link_articles
 
-def insert_article(article):
-    conn = mysql.connector.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+ARTICLE_COLUMNS = (
+    "feed_id",
+    "hub_name",
+    "short_title",
+    "url",
+    "source",
+    "source_other",
+    "author",
+    "summary",
+    "category",
+    "more_than_1",
+    "date",
+)
 
-    query = """
-        INSERT INTO articles (
-            feed_id,
-            hub_name,
-            short_title,
-            url,
-            source,
-            source_other,
-            author,
-            content,
-            summary,
-            category,
-            more_than_1,
-            date
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+# Rows per multi-row INSERT statement
+BULK_INSERT_ROWS = 200
 
-    values = (
+
+def _article_values(article):
+    return (
         article.get("feed_id"),
         article.get("hub_name"),
         article.get("short_title"),
@@ -31,18 +28,124 @@ def insert_article(article):
         article.get("source", "Other"),
         article.get("source_other"),
         article.get("author"),
-        article.get("content"),
         article.get("summary"),
         article.get("category"),
         int(article.get("more_than_1") or 0),
         article.get("date"),
     )
 
+
+def _bulk_insert_sql(row_count):
+    """
+    Multi-row insert. An article already stored for the hub hits the
+    UNIQUE (hub_name, url) key and is left untouched, counting as skipped.
+    """
+    placeholders = "(" + ", ".join(["%s"] * len(ARTICLE_COLUMNS)) + ")"
+    return (
+        f"INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)}) "
+        f"VALUES {', '.join([placeholders] * row_count)} "
+        f"ON DUPLICATE KEY UPDATE id = id"
+    )
+
+
+def insert_article(article):
+    inserted, _, _ = insert_articles([article])
+    return inserted == 1
+
+
+def insert_articles(articles):
+    """
+    Insert a batch of articles as multi-row INSERTs in one transaction.
+    Duplicates on (hub_name, url) are skipped by the database.
+    New rows are linked to their canonical article; each article's "content"
+    goes to the compressed article_bodies store once per canonical article.
+
+    Returns (inserted, skipped, failed): skipped rows were already stored,
+    failed rows hit a database error and were not stored.
+    """
+    articles = list(articles)
+    if not articles:
+        return 0, 0, 0
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        inserted = 0
+        try:
+            for i in range(0, len(articles), BULK_INSERT_ROWS):
+                chunk = articles[i:i + BULK_INSERT_ROWS]
+                params = [v for article in chunk for v in _article_values(article)]
+                cursor.execute(_bulk_insert_sql(len(chunk)), params)
+                inserted += cursor.rowcount   # 1 per new row, 0 per duplicate
+                _link_stored(conn, chunk)
+            conn.commit()
+        except DB_ERRORS as e:
+            # One bad row shouldn't lose the batch: retry row by row
+            conn.rollback()
+            print(f"Bulk insert failed ({e}); retrying {len(articles)} row(s) one at a time")
+            inserted = failed = 0
+            for article in articles:
+                try:
+                    cursor.execute(_bulk_insert_sql(1), _article_values(article))
+                    row_inserted = cursor.rowcount
+                    _link_stored(conn, [article])
+                    conn.commit()
+                    inserted += row_inserted
+                except DB_ERRORS as row_error:
+                    conn.rollback()
+                    failed += 1
+                    print(f"Error inserting article ({article.get('url')}): {row_error}")
+            return inserted, len(articles) - inserted - failed, failed
+
+        return inserted, len(articles) - inserted, 0
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _link_stored(conn, articles):
+    # Look up the ids the rows got, then link new ones to their canonical
+    # article (which also stores the body once, see db/canonical.py)
+    urls = list({a.get("url") for a in articles if a.get("url")})
+    if not urls:
+        return
+    hubs = list({a.get("hub_name") for a in articles})
+
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT id, hub_name, url FROM articles "
+        f"WHERE canonical_id IS NULL "
+        f"AND hub_name IN ({', '.join(['%s'] * len(hubs))}) "
+        f"AND url IN ({', '.join(['%s'] * len(urls))})",
+        hubs + urls,
+    )
+    ids = {(hub_name, url): article_id for article_id, hub_name, url in cursor.fetchall()}
+    cursor.close()
+
+    rows = []
+    for a in articles:
+        article_id = ids.get((a.get("hub_name"), a.get("url")))
+        if article_id is not None:
+            rows.append({
+                "id": article_id,
+                "url": a["url"],
+                "short_title": a.get("short_title"),
+                "content": a.get("content"),
+            })
+    link_articles(conn, rows)
+
+
+def load_known_urls():
+    """
+    Returns a set of (hub_name, url) for every stored article, loaded once
+    per run so the fetcher can skip entries it has already stored before
+    downloading their pages.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
     try:
-        cursor.execute(query, values)
-        conn.commit()
-    except mysql.connector.Error as e:
-        print(f"Error inserting article ({article.get('url')}): {e}")
+        cursor.execute("SELECT hub_name, url FROM articles WHERE url IS NOT NULL")
+        return {(hub_name, url) for hub_name, url in cursor}
     finally:
         cursor.close()
         conn.close()
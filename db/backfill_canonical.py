@@ -0,0 +1,48 @@
+"""
+Link articles stored before the canonical layer existed.
+
+    python -m db.backfill_canonical
+
+Safe to re-run: only rows with canonical_id IS NULL are touched. Existing
+summaries are adopted by their canonical article so they aren't recomputed.
+"""
+from db.connection import get_connection
+from db.canonical import link_articles
+
+PAGE_SIZE = 500
+
+
+def backfill_canonical():
+    conn = get_connection()
+    last_id = 0
+    total = 0
+    try:
+        while True:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT a.id, a.url, a.short_title, a.summary,
+                       CASE WHEN b.article_id IS NULL THEN 0 ELSE 1 END AS has_body
+                FROM articles a
+                LEFT JOIN article_bodies b ON b.article_id = a.id
+                WHERE a.id > %s AND a.canonical_id IS NULL
+                ORDER BY a.id ASC
+                LIMIT %s
+            """, (last_id, PAGE_SIZE))
+            rows = cursor.fetchall()
+            cursor.close()
+            if not rows:
+                break
+
+            link_articles(conn, rows)
+            conn.commit()
+            total += len(rows)
+            last_id = rows[-1]["id"]
+            print(f"[INFO] Linked {total} article(s) (up to id {last_id})")
+    finally:
+        conn.close()
+
+    print(f"[OK] Backfill complete: {total} article(s) linked.")
+
+
+if __name__ == "__main__":
+    backfill_canonical()
@@ -0,0 +1,61 @@
+import struct
+import zlib
+
+# Article bodies live in article_bodies (article_id -> compressed body), not in
+# articles.content, so scans of the articles table stay small. Stages load a
+# body only when they actually need the text.
+#
+# Format matches MySQL COMPRESS(): 4-byte little-endian uncompressed length,
+# then a zlib stream ('' is stored as empty bytes).
+
+
+def compress_body(text):
+    if not text:
+        return b""
+    raw = text.encode("utf-8")
+    return struct.pack("<I", len(raw)) + zlib.compress(raw, 6)
+
+
+def decompress_body(data):
+    if not data:
+        return ""
+    # decompressobj ignores the '.' MySQL appends when the data ends in a space
+    return zlib.decompressobj().decompress(bytes(data[4:])).decode("utf-8")
+
+
+def save_bodies(conn, bodies):
+    """
+    bodies: {article_id: text}. Existing bodies are left as they are.
+    Runs on the caller's connection; the caller commits.
+    """
+    if not bodies:
+        return
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO article_bodies (article_id, body) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE article_id = article_id",
+        [(article_id, compress_body(text)) for article_id, text in bodies.items()],
+    )
+    cursor.close()
+
+
+def load_bodies(conn, article_ids):
+    """
+    Returns {article_id: text} for the given ids (missing bodies are absent).
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(article_ids))
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT article_id, body FROM article_bodies WHERE article_id IN ({placeholders})",
+        article_ids,
+    )
+    bodies = {article_id: decompress_body(body) for article_id, body in cursor.fetchall()}
+    cursor.close()
+    return bodies
+
+
+def load_body(conn, article_id):
+    return load_bodies(conn, [article_id]).get(article_id)
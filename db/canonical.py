@@ -0,0 +1,163 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from db.body_store import save_bodies
+
+# Canonical article layer: one canonical_articles row per distinct article,
+# however many hubs carry it. Each per-hub articles row points at it through
+# articles.canonical_id. The summarizer and categorizer work on canonical rows,
+# and their results are copied to every linked hub row, so each article goes
+# through each model once.
+#
+# The body is stored once, under the first hub row that had it
+# (canonical_articles.body_article_id -> article_bodies).
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+def normalize_url(url):
+    """
+    Same article, same string: https, lowercase host without www./default
+    port, no fragment, no tracking params, sorted query, no trailing slash.
+    """
+    parts = urlsplit((url or "").strip())
+    host = parts.hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def url_key(url):
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def link_articles(conn, rows):
+    """
+    Attach hub article rows to their canonical article, creating it if needed.
+
+    rows: dicts with "id", "url", "short_title" and optionally
+      "content"  - body text to store if the canonical has no body yet
+      "has_body" - the row already has an article_bodies entry
+      "summary"  - an existing summary to adopt if the canonical has none
+
+    Summaries / categories already on the canonical are copied onto the hub
+    rows, so a second hub never waits on the models. Runs on the caller's
+    connection; the caller commits.
+    """
+    rows = [r for r in rows if r.get("url")]
+    if not rows:
+        return
+
+    keyed = [(url_key(r["url"]), r) for r in rows]
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO canonical_articles (url_key, url, short_title) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE url_key = url_key",
+        list({key: (key, r["url"], r.get("short_title")) for key, r in keyed}.values()),
+    )
+
+    keys = list({key for key, _ in keyed})
+    cursor.execute(
+        f"SELECT id, url_key, body_article_id, summary, category FROM canonical_articles "
+        f"WHERE url_key IN ({', '.join(['%s'] * len(keys))})",
+        keys,
+    )
+    canon = {
+        key: {"id": cid, "body_article_id": body_id, "summary": summary, "category": category}
+        for cid, key, body_id, summary, category in cursor.fetchall()
+    }
+
+    # One statement per step for the whole batch, not one per row
+    article_ids = [r["id"] for _, r in keyed]
+    _update_by_id(cursor, "articles", "canonical_id", {r["id"]: canon[key]["id"] for key, r in keyed})
+
+    # Body: the first row per canonical that brings one, for canonicals without a body.
+    # Conditional so that of two concurrent inserters only one owns the body.
+    body_owner = {}
+    for key, r in keyed:
+        c = canon[key]
+        if c["body_article_id"] is None and (r.get("content") or r.get("has_body")):
+            body_owner.setdefault(c["id"], r)
+    bodies = {}
+    if body_owner:
+        _update_by_id(cursor, "canonical_articles", "body_article_id",
+                      {cid: r["id"] for cid, r in body_owner.items()},
+                      "body_article_id IS NULL")
+        cursor.execute(
+            f"SELECT id, body_article_id FROM canonical_articles "
+            f"WHERE id IN ({', '.join(['%s'] * len(body_owner))})",
+            list(body_owner),
+        )
+        for cid, body_id in cursor.fetchall():
+            r = body_owner[cid]
+            if body_id == r["id"] and r.get("content"):
+                bodies[r["id"]] = r["content"]
+
+    # Adopt an existing hub summary onto canonicals that have none...
+    adopt = {}
+    for key, r in keyed:
+        if not canon[key]["summary"] and r.get("summary"):
+            adopt.setdefault(canon[key]["id"], r["summary"])
+    if adopt:
+        _update_by_id(cursor, "canonical_articles", "summary", adopt, "(summary IS NULL OR summary = '')")
+
+    # ...then copy canonical summaries / categories onto hub rows still missing them
+    for column in ("summary", "category"):
+        cursor.execute(
+            f"UPDATE articles SET {column} = "
+            f"(SELECT c.{column} FROM canonical_articles c WHERE c.id = articles.canonical_id) "
+            f"WHERE id IN ({', '.join(['%s'] * len(article_ids))}) "
+            f"AND ({column} IS NULL OR {column} = '') "
+            f"AND canonical_id IN (SELECT id FROM canonical_articles "
+            f"WHERE {column} IS NOT NULL AND {column} <> '')",
+            article_ids,
+        )
+    cursor.close()
+    save_bodies(conn, bodies)
+
+
+def _update_by_id(cursor, table, column, values, condition=None):
+    # UPDATE table SET column = <value for that id> for many ids in one statement
+    ids = list(values)
+    cases = " ".join(["WHEN %s THEN %s"] * len(ids))
+    where = f" AND {condition}" if condition else ""
+    cursor.execute(
+        f"UPDATE {table} SET {column} = CASE id {cases} END "
+        f"WHERE id IN ({', '.join(['%s'] * len(ids))}){where}",
+        [v for i in ids for v in (i, values[i])] + ids,
+    )
+
+
+def store_summary(conn, canonical_id, summary):
+    # Save on the canonical row and every hub row linked to it
+    cursor = conn.cursor()
+    cursor.execute("UPDATE canonical_articles SET summary = %s WHERE id = %s", (summary, canonical_id))
+    cursor.execute("UPDATE articles SET summary = %s WHERE canonical_id = %s", (summary, canonical_id))
+    conn.commit()
+    cursor.close()
+
+
+def store_category(conn, canonical_id, category, only_empty=True):
+    """
+    Save on the canonical row, and on linked hub rows that have no category
+    yet (hub rows may carry their feed's category from insert time).
+    """
+    cursor = conn.cursor()
+    cursor.execute("UPDATE canonical_articles SET category = %s WHERE id = %s", (category, canonical_id))
+    if only_empty:
+        cursor.execute(
+            "UPDATE articles SET category = %s WHERE canonical_id = %s AND (category IS NULL OR category = '')",
+            (category, canonical_id),
+        )
+    else:
+        cursor.execute("UPDATE articles SET category = %s WHERE canonical_id = %s", (category, canonical_id))
+    conn.commit()
+    cursor.close()
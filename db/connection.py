@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import errors, pooling
+
+from config.db_config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_BACKEND
+from db.sqlite_backend import SQLiteConnection
+
+# One MySQL connection pool per process, shared by every repository and stage.
+# Connections from get_connection() go back to the pool on close().
+# With DB_BACKEND=sqlite, connections are opened on the local database file
+# instead (cheap, no network), behind the same interface.
+
+# Catch these instead of mysql.connector.Error so code works on either backend
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+_stats = {"checkouts": 0, "in_use": 0, "peak_in_use": 0, "waits": 0, "reconnects": 0}
+_stats_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="pipeline",
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=True,
+                    **DB_CONFIG,
+                )
+    return _pool
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a pooled mysql connection that keeps the usage
+    stats honest. Everything except close() is passed straight through.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        with _stats_lock:
+            _stats["in_use"] -= 1
+        self._conn.close()  # returns it to the pool
+
+
+def get_connection():
+    """
+    Borrow a connection from the shared pool (waits up to DB_POOL_TIMEOUT
+    seconds when all are busy). The connection is pinged first and
+    reconnected if the server dropped it.
+    """
+    if DB_BACKEND == "sqlite":
+        conn = SQLiteConnection()
+        _count_checkout(waited=False)
+        return PooledConnection(conn)
+
+    pool = _get_pool()
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+    waited = False
+
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except errors.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            waited = True
+            time.sleep(0.05)
+
+    # Health check: idle pooled connections can be closed by the server
+    try:
+        conn.ping(reconnect=False)
+    except mysql.connector.Error:
+        conn.ping(reconnect=True, attempts=3, delay=1)
+        with _stats_lock:
+            _stats["reconnects"] += 1
+
+    _count_checkout(waited)
+    return PooledConnection(conn)
+
+
+def _count_checkout(waited):
+    with _stats_lock:
+        _stats["checkouts"] += 1
+        _stats["in_use"] += 1
+        _stats["peak_in_use"] = max(_stats["peak_in_use"], _stats["in_use"])
+        if waited:
+            _stats["waits"] += 1
+
+
+def pool_stats():
+    with _stats_lock:
+        s = dict(_stats)
+    s["pool_size"] = DB_POOL_SIZE
+    s["backend"] = DB_BACKEND
+    return s
+
+
+def print_pool_stats():
+    s = pool_stats()
+    print(
+        f"[INFO] DB pool ({s['backend']}): size {s['pool_size']}, {s['checkouts']} checkout(s), "
+        f"peak {s['peak_in_use']} in use, {s['waits']} wait(s), {s['reconnects']} reconnect(s)"
+    )
@@ -1,15 +1,15 @@
-import mysql.connector
-from config.db_config import DB_CONFIG
+from db.connection import get_connection
 
 
 def get_all_active_feeds():
     try:
         """
         Returns a list of tuples:
-        (feed_id, feed_url, feed_name, feed_category, hub_name)
+        (feed_id, feed_url, feed_name, feed_category, hub_name, etag, last_modified)
         One row per (feed, hub) pair based on feed_hub_map.
+        etag / last_modified are the HTTP validators from the previous poll.
         """
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = get_connection()
         cursor = conn.cursor()
 
         query = """
@@ -18,7 +18,9 @@ def get_all_active_feeds():
             rf.feed_url AS feed_url,
             rf.feed_name AS feed_name,
             rf.feed_category AS feed_category,
-            h.hub_name AS hub_name
+            h.hub_name AS hub_name,
+            rf.etag AS etag,
+            rf.last_modified AS last_modified
             FROM rss_feeds rf
             JOIN feed_hub_map fhm ON fhm.feed_id = rf.id
             JOIN hubs h ON h.id = fhm.hub_id
@@ -35,3 +37,98 @@ def get_all_active_feeds():
         except: pass
         try: conn.close()
         except: pass
+
+
+def group_feeds_by_url(feeds):
+    """
+    Collapse the (feed, hub) rows from get_all_active_feeds() so each
+    distinct feed URL is fetched once per run.
+
+    Returns a list of dicts:
+      {"feed_url", "feed_name", "etag", "last_modified",
+       "targets": [{"feed_id", "hub_name", "category"}, ...]}
+    """
+    grouped = {}
+    for feed_id, feed_url, feed_name, feed_category, hub_name, etag, last_modified in feeds:
+        key = (feed_url or "").strip()
+        if key not in grouped:
+            grouped[key] = {
+                "feed_url": key,
+                "feed_name": feed_name,
+                "etag": etag,
+                "last_modified": last_modified,
+                "targets": [],
+            }
+        grouped[key]["targets"].append({
+            "feed_id": feed_id,
+            "hub_name": hub_name,
+            "category": feed_category,
+        })
+    return list(grouped.values())
+
+
+def update_feed_validators(feed_url, etag, last_modified):
+    """
+    Store the ETag / Last-Modified returned by the last successful poll so the
+    next poll can send them back as If-None-Match / If-Modified-Since.
+    Columns added by db/migrations/0002_feed_polling_columns.sql.
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE rss_feeds SET etag=%s, last_modified=%s WHERE feed_url=%s",
+            (etag, last_modified, feed_url),
+        )
+        conn.commit()
+    except Exception as e:
+        print(f" Failed to save validators for {feed_url}: {e}")
+    finally:
+        try: cursor.close()
+        except: pass
+        try: conn.close()
+        except: pass
+
+
+def get_feed_schedules():
+    """
+    Returns {feed_url: (poll_interval_seconds, next_poll_at)} for active feeds.
+    Either value may be None for a feed that hasn't been scheduled yet.
+    Columns added by db/migrations/0002_feed_polling_columns.sql.
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT feed_url, poll_interval, next_poll_at FROM rss_feeds WHERE active = 1"
+        )
+        return {url.strip(): (interval, next_at) for url, interval, next_at in cursor.fetchall()}
+    except Exception as e:
+        print(f" Failed to load feed schedules from DB: {e}")
+        return {}
+    finally:
+        try: cursor.close()
+        except: pass
+        try: conn.close()
+        except: pass
+
+
+def update_feed_schedule(feed_url, poll_interval, next_poll_at):
+    """
+    next_poll_at: 'YYYY-MM-DD HH:MM:SS' (UTC)
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE rss_feeds SET poll_interval=%s, next_poll_at=%s WHERE feed_url=%s",
+            (poll_interval, next_poll_at, feed_url),
+        )
+        conn.commit()
+    except Exception as e:
+        print(f" Failed to save schedule for {feed_url}: {e}")
+    finally:
+        try: cursor.close()
+        except: pass
+        try: conn.close()
+        except: pass
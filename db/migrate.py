@@ -0,0 +1,249 @@
+"""
+Schema migrations for the pipeline database.
+
+    python -m db.migrate            apply pending migrations
+    python -m db.migrate status     list applied / pending migrations
+    python -m db.migrate check      EXPLAIN each stage's hot queries, flag full scans
+
+Migrations are the numbered .sql files in db/migrations/ (db/migrations/sqlite/
+when DB_BACKEND=sqlite), applied in order and recorded in schema_migrations.
+Both directories use the same version numbers. Statements are separated by
+';' at line end.
+"""
+import datetime
+import os
+import sys
+
+from config.db_config import DB_BACKEND
+from db.connection import get_connection, DB_ERRORS
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+if DB_BACKEND == "sqlite":
+    MIGRATIONS_DIR = os.path.join(MIGRATIONS_DIR, "sqlite")
+
+# Errors meaning "this change is already in place" on databases that were
+# patched by hand before migrations existed: duplicate column / key name.
+ALREADY_APPLIED_ERRNOS = {1060, 1061}
+ALREADY_APPLIED_SQLITE = ("duplicate column name", "already exists")
+
+# The queries each stage runs on every pass, with sample parameters.
+# Keep these in step with the modules named alongside them.
+HOT_QUERIES = [
+    ("fetch: get_all_active_feeds", """
+        SELECT rf.id, rf.feed_url, rf.feed_name, rf.feed_category, h.hub_name, rf.etag, rf.last_modified
+        FROM rss_feeds rf
+        JOIN feed_hub_map fhm ON fhm.feed_id = rf.id
+        JOIN hubs h ON h.id = fhm.hub_id
+        WHERE rf.active = 1
+        ORDER BY h.hub_name, rf.feed_name
+    """, ()),
+    ("fetch: update_feed_validators", """
+        SELECT id FROM rss_feeds WHERE feed_url = %s
+    """, ("https://example.com/feed",)),
+    ("summarize: iter_articles_to_summarize", """
+        SELECT c.id, c.body_article_id FROM canonical_articles c
+        WHERE c.id > %s AND c.body_article_id IS NOT NULL
+          AND (c.summary IS NULL OR c.summary = '')
+          AND NOT EXISTS (SELECT 1 FROM work_leases wl WHERE wl.stage = 'summarize_canonical'
+                          AND wl.item_id = c.id AND wl.leased_until >= %s)
+        ORDER BY c.id ASC
+        LIMIT %s
+    """, (0, 0, 20)),
+    ("categorize: fetch_batch", """
+        SELECT c.id, c.short_title, c.summary, c.body_article_id
+        FROM canonical_articles c
+        WHERE c.id > %s
+          AND (c.category IS NULL OR c.category='')
+          AND EXISTS (SELECT 1 FROM articles a WHERE a.canonical_id = c.id
+                      AND (a.category IS NULL OR a.category=''))
+          AND NOT EXISTS (SELECT 1 FROM work_leases wl WHERE wl.stage = 'categorize_canonical'
+                          AND wl.item_id = c.id AND wl.leased_until >= %s)
+        ORDER BY c.id ASC
+        LIMIT %s
+    """, (0, 0, 150)),
+    ("fetch: link_articles", """
+        SELECT id, url_key, body_article_id, summary, category FROM canonical_articles
+        WHERE url_key IN (%s)
+    """, ("0" * 64,)),
+    ("publish: get_pending_articles", """
+        SELECT a.id, a.hub_name, h.id
+        FROM articles a
+        JOIN hubs h ON h.hub_name = a.hub_name
+        LEFT JOIN article_push ap ON ap.article_id = a.id AND ap.hub_id = h.id
+        WHERE ap.id IS NULL
+          AND NOT EXISTS (SELECT 1 FROM work_leases wl WHERE wl.stage = 'publish'
+                          AND wl.item_id = a.id AND wl.leased_until >= %s)
+        ORDER BY a.fetched_at ASC
+        LIMIT %s
+    """, (0, 10)),
+    ("publish: get_unpushed_featured_news_items", """
+        SELECT ap.id, ap.wp_news_item_id, h.hub_name
+        FROM article_push ap
+        JOIN hubs h ON h.id = ap.hub_id
+        WHERE ap.wp_news_item_id IS NOT NULL
+          AND ap.posted_to_featured_post = 0
+        ORDER BY ap.id ASC
+    """, ()),
+    ("publish: get_unpushed_news_items", """
+        SELECT ap.id, ap.wp_news_item_id, h.hub_name
+        FROM article_push ap
+        JOIN hubs h ON h.id = ap.hub_id
+        WHERE ap.wp_news_item_id IS NOT NULL
+          AND ap.pushed_post_id IS NULL
+        ORDER BY ap.id ASC
+    """, ()),
+    ("posts: populate_wp_post_ids", """
+        SELECT id, post_url FROM posts WHERE wp_post_id IS NULL
+    """, ()),
+]
+
+
+def migration_files():
+    files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+    return [(f.split("_", 1)[0], os.path.join(MIGRATIONS_DIR, f)) for f in files]
+
+
+def split_statements(sql):
+    statements, current = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current).rstrip().rstrip(";"))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def already_applied(error):
+    if getattr(error, "errno", None) in ALREADY_APPLIED_ERRNOS:
+        return True
+    return any(msg in str(error).lower() for msg in ALREADY_APPLIED_SQLITE)
+
+
+def ensure_migrations_table(conn):
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(32) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """)
+    conn.commit()
+    cur.close()
+
+
+def applied_versions(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cur.fetchall()}
+    cur.close()
+    return versions
+
+
+def migrate():
+    conn = get_connection()
+    try:
+        ensure_migrations_table(conn)
+        done = applied_versions(conn)
+        pending = [(v, path) for v, path in migration_files() if v not in done]
+        if not pending:
+            print("[INFO] Schema is up to date.")
+            return
+
+        for version, path in pending:
+            name = os.path.basename(path)
+            print(f"[INFO] Applying {name}...")
+            with open(path, encoding="utf-8") as fh:
+                statements = split_statements(fh.read())
+
+            cur = conn.cursor()
+            for stmt in statements:
+                try:
+                    cur.execute(stmt)
+                except DB_ERRORS as e:
+                    if already_applied(e):
+                        print(f"[INFO]   already in place, skipping: {e}")
+                        continue
+                    print(f"[ERROR] {name} failed on:\n{stmt}\n→ {e}")
+                    raise
+                if stmt.lstrip().upper().startswith(("UPDATE", "DELETE")) and cur.rowcount > 0:
+                    print(f"[INFO]   {cur.rowcount} row(s) changed by: {stmt.split(chr(10))[0]}")
+
+            now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (%s, %s, %s)",
+                (version, name, now),
+            )
+            conn.commit()
+            cur.close()
+            print(f"[OK] {name}")
+    finally:
+        conn.close()
+
+
+def status():
+    conn = get_connection()
+    try:
+        ensure_migrations_table(conn)
+        done = applied_versions(conn)
+        for version, path in migration_files():
+            mark = "applied" if version in done else "PENDING"
+            print(f"{mark:8} {os.path.basename(path)}")
+    finally:
+        conn.close()
+
+
+def check():
+    """
+    EXPLAIN every hot query and flag tables read with a full scan
+    (MySQL type=ALL; SQLite 'SCAN <table>' without an index).
+    Returns the number of flagged queries.
+    """
+    conn = get_connection()
+    flagged = 0
+    try:
+        for label, sql, params in HOT_QUERIES:
+            cur = conn.cursor(dictionary=True)
+            if DB_BACKEND == "sqlite":
+                cur.execute("EXPLAIN QUERY PLAN " + sql, params)
+                plan = [row["detail"] for row in cur.fetchall()]
+                scans = [d for d in plan if d.startswith("SCAN") and "INDEX" not in d]
+                access = "; ".join(plan)
+            else:
+                cur.execute("EXPLAIN " + sql, params)
+                rows = cur.fetchall()
+                scans = [
+                    f"{r.get('table')} (~{r.get('rows')} rows)"
+                    for r in rows if (r.get("type") or "").upper() == "ALL"
+                ]
+                access = ", ".join(f"{r.get('table')}:{r.get('type')}/{r.get('key')}" for r in rows)
+            cur.close()
+
+            if scans:
+                flagged += 1
+                print(f"[FULL SCAN] {label}: {', '.join(scans)}")
+            else:
+                print(f"[OK] {label}: {access}")
+    finally:
+        conn.close()
+
+    print(f"\n{flagged} of {len(HOT_QUERIES)} hot queries do a full table scan.")
+    return flagged
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+    if command == "migrate":
+        migrate()
+    elif command == "status":
+        status()
+    elif command == "check":
+        sys.exit(1 if check() else 0)
+    else:
+        print(__doc__)
+        sys.exit(2)
@@ -0,0 +1,65 @@
+-- Baseline schema for the pipeline, as the code uses it.
+-- IF NOT EXISTS so it is a no-op on databases created before migrations existed.
+
+CREATE TABLE IF NOT EXISTS hubs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    hub_name VARCHAR(255) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS rss_feeds (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    feed_url VARCHAR(1024) NOT NULL,
+    feed_name VARCHAR(255) NULL,
+    feed_category VARCHAR(255) NULL,
+    active TINYINT(1) NOT NULL DEFAULT 1
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS feed_hub_map (
+    feed_id INT NOT NULL,
+    hub_id INT NOT NULL,
+    PRIMARY KEY (feed_id, hub_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS articles (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    feed_id INT NULL,
+    hub_name VARCHAR(255) NULL,
+    short_title VARCHAR(512) NULL,
+    url VARCHAR(2048) NULL,
+    source VARCHAR(64) NULL,
+    source_other VARCHAR(255) NULL,
+    author VARCHAR(512) NULL,
+    content LONGTEXT NULL,
+    summary TEXT NULL,
+    category VARCHAR(255) NULL,
+    more_than_1 TINYINT(1) NOT NULL DEFAULT 0,
+    date VARCHAR(64) NULL,
+    fetched_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS article_push (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    article_id BIGINT NOT NULL,
+    hub_id INT NOT NULL,
+    wp_news_item_id BIGINT NULL,
+    wp_news_item_url VARCHAR(1024) NULL,
+    wp_news_item_status VARCHAR(32) NULL,
+    pushed_at DATETIME NULL,
+    pushed_post_id BIGINT NULL,
+    pushed_post_status TINYINT(1) NULL,
+    pushed_to_post_at DATETIME NULL,
+    posted_to_featured_post TINYINT(1) NOT NULL DEFAULT 0,
+    posted_to_featured_post_at DATETIME NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS posts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    post_url VARCHAR(1024) NOT NULL,
+    wp_post_id BIGINT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS feed_post_map (
+    feed_id INT NOT NULL,
+    post_id INT NOT NULL,
+    PRIMARY KEY (feed_id, post_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
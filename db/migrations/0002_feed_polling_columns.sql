@@ -0,0 +1,6 @@
+-- Conditional GET validators and the adaptive scheduler's per-feed state.
+
+ALTER TABLE rss_feeds ADD COLUMN etag VARCHAR(255) NULL;
+ALTER TABLE rss_feeds ADD COLUMN last_modified VARCHAR(64) NULL;
+ALTER TABLE rss_feeds ADD COLUMN poll_interval INT NULL;
+ALTER TABLE rss_feeds ADD COLUMN next_poll_at DATETIME NULL;
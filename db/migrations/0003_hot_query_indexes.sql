@@ -0,0 +1,75 @@
+-- Indexes for the queries every stage runs on each pass.
+-- `python -m db.migrate check` EXPLAINs those queries against these.
+
+-- feed loading: active feeds, joined to hubs by id; validator/schedule updates by URL
+CREATE INDEX idx_rss_feeds_active ON rss_feeds (active);
+CREATE INDEX idx_rss_feeds_url ON rss_feeds (feed_url(255));
+CREATE INDEX idx_feed_hub_map_hub ON feed_hub_map (hub_id);
+
+-- hubs are joined by name from articles (publish) and should be unique.
+-- Older databases can hold duplicate names: keep the lowest id per name and
+-- point feed_hub_map / article_push at it before adding the unique key.
+UPDATE IGNORE feed_hub_map fhm
+JOIN (SELECT h.id, k.keep_id FROM hubs h
+      JOIN (SELECT hub_name, MIN(id) AS keep_id FROM hubs GROUP BY hub_name HAVING COUNT(*) > 1) k
+        ON k.hub_name = h.hub_name AND h.id <> k.keep_id) d ON d.id = fhm.hub_id
+SET fhm.hub_id = d.keep_id;
+DELETE fhm FROM feed_hub_map fhm
+JOIN (SELECT h.id FROM hubs h
+      JOIN (SELECT hub_name, MIN(id) AS keep_id FROM hubs GROUP BY hub_name HAVING COUNT(*) > 1) k
+        ON k.hub_name = h.hub_name AND h.id <> k.keep_id) d ON d.id = fhm.hub_id;
+UPDATE article_push ap
+JOIN (SELECT h.id, k.keep_id FROM hubs h
+      JOIN (SELECT hub_name, MIN(id) AS keep_id FROM hubs GROUP BY hub_name HAVING COUNT(*) > 1) k
+        ON k.hub_name = h.hub_name AND h.id <> k.keep_id) d ON d.id = ap.hub_id
+SET ap.hub_id = d.keep_id;
+DELETE h FROM hubs h
+JOIN (SELECT hub_name, MIN(id) AS keep_id FROM hubs GROUP BY hub_name) k
+  ON k.hub_name = h.hub_name AND h.id > k.keep_id;
+CREATE UNIQUE INDEX uq_hubs_hub_name ON hubs (hub_name);
+
+-- bulk insert dedupe + known-URL index load; also serves hub_name joins.
+-- The baseline insert stored duplicates: keep the lowest id per (hub, url
+-- prefix the index covers) and point article_push at it.
+UPDATE article_push ap
+JOIN (SELECT a.id, k.keep_id FROM articles a
+      JOIN (SELECT hub_name, LEFT(url, 500) AS url_prefix, MIN(id) AS keep_id FROM articles
+            WHERE hub_name IS NOT NULL AND url IS NOT NULL
+            GROUP BY hub_name, LEFT(url, 500) HAVING COUNT(*) > 1) k
+        ON k.hub_name = a.hub_name AND k.url_prefix = LEFT(a.url, 500) AND a.id <> k.keep_id) d
+  ON d.id = ap.article_id
+SET ap.article_id = d.keep_id;
+DELETE a FROM articles a
+JOIN (SELECT hub_name, LEFT(url, 500) AS url_prefix, MIN(id) AS keep_id FROM articles
+      WHERE hub_name IS NOT NULL AND url IS NOT NULL
+      GROUP BY hub_name, LEFT(url, 500) HAVING COUNT(*) > 1) k
+  ON k.hub_name = a.hub_name AND k.url_prefix = LEFT(a.url, 500) AND a.id > k.keep_id;
+CREATE UNIQUE INDEX uq_articles_hub_url ON articles (hub_name, url(500));
+
+-- summarizer: summary IS NULL OR summary = ''  (a 1-char prefix is enough for both)
+CREATE INDEX idx_articles_summary ON articles (summary(1));
+
+-- categorizer: category IS NULL OR category = '' ORDER BY id
+CREATE INDEX idx_articles_category_id ON articles (category, id);
+
+-- publish: ORDER BY a.fetched_at
+CREATE INDEX idx_articles_fetched_at ON articles (fetched_at);
+CREATE INDEX idx_articles_feed_id ON articles (feed_id);
+
+-- publish: LEFT JOIN article_push ON article_id AND hub_id ... WHERE ap.id IS NULL
+-- (duplicates, including those made by repointing above: keep the lowest id)
+DELETE ap FROM article_push ap
+JOIN (SELECT article_id, hub_id, MIN(id) AS keep_id FROM article_push
+      GROUP BY article_id, hub_id HAVING COUNT(*) > 1) k
+  ON k.article_id = ap.article_id AND k.hub_id = ap.hub_id AND ap.id > k.keep_id;
+CREATE UNIQUE INDEX uq_article_push_article_hub ON article_push (article_id, hub_id);
+
+-- featured posts: posted_to_featured_post = 0 ORDER BY id
+CREATE INDEX idx_article_push_featured ON article_push (posted_to_featured_post, id);
+
+-- posts: pushed_post_id IS NULL ORDER BY id
+CREATE INDEX idx_article_push_post ON article_push (pushed_post_id, id);
+
+-- populate_wp_post_ids: wp_post_id IS NULL
+CREATE INDEX idx_posts_wp_post_id ON posts (wp_post_id);
+CREATE INDEX idx_feed_post_map_post ON feed_post_map (post_id);
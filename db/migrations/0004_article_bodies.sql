@@ -0,0 +1,16 @@
+-- Article bodies move out of the hot articles table into a compressed side table.
+-- body uses MySQL's COMPRESS() format (4-byte little-endian length + zlib stream),
+-- which db/body_store.py reads and writes, so the backfill can run in SQL.
+
+CREATE TABLE IF NOT EXISTS article_bodies (
+    article_id BIGINT NOT NULL PRIMARY KEY,
+    body LONGBLOB NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO article_bodies (article_id, body)
+SELECT id, COMPRESS(content) FROM articles WHERE content IS NOT NULL;
+
+UPDATE articles a
+JOIN article_bodies b ON b.article_id = a.id
+SET a.content = NULL
+WHERE a.content IS NOT NULL;
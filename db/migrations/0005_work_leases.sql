@@ -0,0 +1,11 @@
+-- Leases that let several summarize / categorize / publish workers split the
+-- backlog without doing the same row twice. leased_until is epoch seconds.
+
+CREATE TABLE IF NOT EXISTS work_leases (
+    stage VARCHAR(32) NOT NULL,
+    item_id BIGINT NOT NULL,
+    worker_id VARCHAR(128) NOT NULL,
+    leased_until BIGINT NOT NULL,
+    PRIMARY KEY (stage, item_id),
+    KEY idx_work_leases_until (leased_until)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
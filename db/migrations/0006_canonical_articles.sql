@@ -0,0 +1,21 @@
+-- One canonical row per distinct article (by normalized URL), shared by every
+-- hub that carries it. articles stays the per-hub row and links here through
+-- canonical_id; summary / category are computed once on the canonical row and
+-- copied to its hub rows. Existing rows are linked by `python -m db.backfill_canonical`.
+
+CREATE TABLE IF NOT EXISTS canonical_articles (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    url_key CHAR(64) NOT NULL,
+    url VARCHAR(2048) NULL,
+    short_title VARCHAR(512) NULL,
+    body_article_id BIGINT NULL,
+    summary TEXT NULL,
+    category VARCHAR(255) NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_canonical_url_key (url_key),
+    KEY idx_canonical_summary (summary(1)),
+    KEY idx_canonical_category_id (category, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+ALTER TABLE articles ADD COLUMN canonical_id BIGINT NULL;
+CREATE INDEX idx_articles_canonical ON articles (canonical_id);
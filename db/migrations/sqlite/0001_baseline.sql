@@ -0,0 +1,64 @@
+-- SQLite version of the baseline schema (DB_BACKEND=sqlite).
+
+CREATE TABLE IF NOT EXISTS hubs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hub_name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rss_feeds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_url TEXT NOT NULL,
+    feed_name TEXT NULL,
+    feed_category TEXT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS feed_hub_map (
+    feed_id INTEGER NOT NULL,
+    hub_id INTEGER NOT NULL,
+    PRIMARY KEY (feed_id, hub_id)
+);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NULL,
+    hub_name TEXT NULL,
+    short_title TEXT NULL,
+    url TEXT NULL,
+    source TEXT NULL,
+    source_other TEXT NULL,
+    author TEXT NULL,
+    content TEXT NULL,
+    summary TEXT NULL,
+    category TEXT NULL,
+    more_than_1 INTEGER NOT NULL DEFAULT 0,
+    date TEXT NULL,
+    fetched_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS article_push (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id INTEGER NOT NULL,
+    hub_id INTEGER NOT NULL,
+    wp_news_item_id INTEGER NULL,
+    wp_news_item_url TEXT NULL,
+    wp_news_item_status TEXT NULL,
+    pushed_at TEXT NULL,
+    pushed_post_id INTEGER NULL,
+    pushed_post_status INTEGER NULL,
+    pushed_to_post_at TEXT NULL,
+    posted_to_featured_post INTEGER NOT NULL DEFAULT 0,
+    posted_to_featured_post_at TEXT NULL
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_url TEXT NOT NULL,
+    wp_post_id INTEGER NULL
+);
+
+CREATE TABLE IF NOT EXISTS feed_post_map (
+    feed_id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    PRIMARY KEY (feed_id, post_id)
+);
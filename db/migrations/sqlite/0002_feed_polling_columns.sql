@@ -0,0 +1,4 @@
+ALTER TABLE rss_feeds ADD COLUMN etag TEXT NULL;
+ALTER TABLE rss_feeds ADD COLUMN last_modified TEXT NULL;
+ALTER TABLE rss_feeds ADD COLUMN poll_interval INTEGER NULL;
+ALTER TABLE rss_feeds ADD COLUMN next_poll_at TEXT NULL;
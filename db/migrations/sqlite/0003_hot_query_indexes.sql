@@ -0,0 +1,39 @@
+-- Same indexes as the MySQL migration; SQLite has no prefix indexes, so whole columns.
+-- Duplicates are removed first (lowest id kept, references repointed), as in MySQL.
+
+CREATE INDEX IF NOT EXISTS idx_rss_feeds_active ON rss_feeds (active);
+CREATE INDEX IF NOT EXISTS idx_rss_feeds_url ON rss_feeds (feed_url);
+CREATE INDEX IF NOT EXISTS idx_feed_hub_map_hub ON feed_hub_map (hub_id);
+
+UPDATE OR IGNORE feed_hub_map
+SET hub_id = (SELECT MIN(k.id) FROM hubs h JOIN hubs k ON k.hub_name = h.hub_name WHERE h.id = feed_hub_map.hub_id)
+WHERE hub_id IN (SELECT id FROM hubs h WHERE id > (SELECT MIN(id) FROM hubs k WHERE k.hub_name = h.hub_name));
+DELETE FROM feed_hub_map
+WHERE hub_id IN (SELECT id FROM hubs h WHERE id > (SELECT MIN(id) FROM hubs k WHERE k.hub_name = h.hub_name));
+UPDATE article_push
+SET hub_id = (SELECT MIN(k.id) FROM hubs h JOIN hubs k ON k.hub_name = h.hub_name WHERE h.id = article_push.hub_id)
+WHERE hub_id IN (SELECT id FROM hubs h WHERE id > (SELECT MIN(id) FROM hubs k WHERE k.hub_name = h.hub_name));
+DELETE FROM hubs WHERE id > (SELECT MIN(id) FROM hubs k WHERE k.hub_name = hubs.hub_name);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_hubs_hub_name ON hubs (hub_name);
+
+UPDATE article_push
+SET article_id = (SELECT MIN(k.id) FROM articles a JOIN articles k ON k.hub_name = a.hub_name AND k.url = a.url
+                  WHERE a.id = article_push.article_id)
+WHERE article_id IN (SELECT id FROM articles a
+                     WHERE id > (SELECT MIN(id) FROM articles k WHERE k.hub_name = a.hub_name AND k.url = a.url));
+DELETE FROM articles
+WHERE id > (SELECT MIN(id) FROM articles k WHERE k.hub_name = articles.hub_name AND k.url = articles.url);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_articles_hub_url ON articles (hub_name, url);
+
+CREATE INDEX IF NOT EXISTS idx_articles_summary ON articles (summary);
+CREATE INDEX IF NOT EXISTS idx_articles_category_id ON articles (category, id);
+CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles (fetched_at);
+CREATE INDEX IF NOT EXISTS idx_articles_feed_id ON articles (feed_id);
+DELETE FROM article_push
+WHERE id > (SELECT MIN(id) FROM article_push k
+            WHERE k.article_id = article_push.article_id AND k.hub_id = article_push.hub_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_article_push_article_hub ON article_push (article_id, hub_id);
+CREATE INDEX IF NOT EXISTS idx_article_push_featured ON article_push (posted_to_featured_post, id);
+CREATE INDEX IF NOT EXISTS idx_article_push_post ON article_push (pushed_post_id, id);
+CREATE INDEX IF NOT EXISTS idx_posts_wp_post_id ON posts (wp_post_id);
+CREATE INDEX IF NOT EXISTS idx_feed_post_map_post ON feed_post_map (post_id);
@@ -0,0 +1,7 @@
+-- Compressed bodies are written by db/body_store.py; SQLite has no COMPRESS(),
+-- so there is no SQL backfill here (SQLite databases start empty).
+
+CREATE TABLE IF NOT EXISTS article_bodies (
+    article_id INTEGER NOT NULL PRIMARY KEY,
+    body BLOB NOT NULL
+);
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS work_leases (
+    stage TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    worker_id TEXT NOT NULL,
+    leased_until INTEGER NOT NULL,
+    PRIMARY KEY (stage, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_work_leases_until ON work_leases (leased_until);
@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS canonical_articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url_key TEXT NOT NULL,
+    url TEXT NULL,
+    short_title TEXT NULL,
+    body_article_id INTEGER NULL,
+    summary TEXT NULL,
+    category TEXT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_canonical_url_key ON canonical_articles (url_key);
+CREATE INDEX IF NOT EXISTS idx_canonical_summary ON canonical_articles (summary);
+CREATE INDEX IF NOT EXISTS idx_canonical_category_id ON canonical_articles (category, id);
+
+ALTER TABLE articles ADD COLUMN canonical_id INTEGER NULL;
+CREATE INDEX IF NOT EXISTS idx_articles_canonical ON articles (canonical_id);
@@ -1,14 +1,12 @@
-import mysql.connector
-from mysql.connector import Error
 from urllib.parse import urlparse
 import requests
 from requests.auth import HTTPBasicAuth
-from config.db_config import DB_CONFIG
+from db.connection import get_connection, DB_ERRORS
 from config.wp_config import WP_DEFAULT_USER, WP_DEFAULT_PASS
 
 
 def get_db_connection():
-    return mysql.connector.connect(**DB_CONFIG)
+    return get_connection()
 
 
 def extract_slug_from_url(url: str) -> str | None:
@@ -83,7 +81,7 @@ def populate_wp_post_ids():
 
             print(f"[OK] posts.id={post_id} updated with wp_post_id={wp_id}")
 
-    except Error as e:
+    except DB_ERRORS as e:
         print(f"[DB ERROR] {e}")
     finally:
         try:
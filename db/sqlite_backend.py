@@ -0,0 +1,95 @@
+import re
+import sqlite3
+
+from config.db_config import SQLITE_PATH
+
+# SQLite stand-in for MySQL, used when DB_BACKEND=sqlite.
+# Connections look like mysql.connector ones to the rest of the code: the same
+# %s-style SQL, cursor(dictionary=True), rowcount, commit/rollback/close.
+# The few MySQL-only constructs the pipeline issues are rewritten on the way in.
+
+_REWRITES = [
+    # upsert-as-ignore used by bulk inserts
+    (re.compile(r"ON DUPLICATE KEY UPDATE\s+(\w+)\s*=\s*\1\b", re.I), "ON CONFLICT DO NOTHING"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+]
+
+
+def translate(sql):
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    # MySQL paramstyle -> sqlite (none of our SQL has a literal %s)
+    return sql.replace("%s", "?")
+
+
+def _dict_row(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate(sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), [tuple(p) for p in seq_of_params])
+        return self
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path=SQLITE_PATH):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")      # readers don't block the writer
+        self._conn.execute("PRAGMA synchronous=NORMAL")    # safe with WAL, far fewer fsyncs
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    def cursor(self, dictionary=False):
+        cur = self._conn.cursor()
+        if dictionary:
+            cur.row_factory = _dict_row
+        return SQLiteCursor(cur)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass  # local file, nothing to reconnect
+
+    def is_connected(self):
+        return True
@@ -0,0 +1,121 @@
+import os
+import socket
+import time
+
+from config.db_config import WORK_LEASE_SECONDS
+
+# Lease-based claiming so several workers (threads, processes or machines) can
+# run the same stage at once and each take disjoint rows.
+#
+# A worker claims item ids for a stage before working on them. The claim is a
+# row in work_leases that expires at leased_until; a crashed worker's claims
+# simply run out and are taken over by the next claim() that sees them.
+# The lease writes are plain UPDATE / INSERT ... ON DUPLICATE KEY statements,
+# atomic per row on MySQL and SQLite alike without SELECT ... FOR UPDATE.
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(conn, stage, item_ids, lease_seconds=WORK_LEASE_SECONDS, worker_id=WORKER_ID, pending_sql=None):
+    """
+    Try to lease each item for this worker. Returns the ids actually claimed,
+    in the order given; ids held by another live lease are left out.
+
+    release() deletes finished leases, so a worker working from an older read
+    of the backlog could lease an item someone else has already done.
+    pending_sql guards against that: a SELECT returning the ids (among
+    "{ids}", filled in with placeholders) that still need this stage, e.g.
+    "SELECT id FROM canonical_articles WHERE id IN ({ids}) AND summary IS NULL".
+    It runs after the leases are taken, so anything finished before our lease
+    went in is seen as done; those leases are dropped again.
+
+    A fixed number of statements per call, however many ids.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return []
+    now = int(time.time())
+    until = now + lease_seconds
+    placeholders = ", ".join(["%s"] * len(item_ids))
+
+    # Start a fresh transaction so the reads below see other workers' latest commits
+    conn.commit()
+    cursor = conn.cursor()
+    try:
+        # Take over expired leases (crashed or slow workers)...
+        cursor.execute(
+            f"UPDATE work_leases SET worker_id = %s, leased_until = %s "
+            f"WHERE stage = %s AND leased_until < %s AND item_id IN ({placeholders})",
+            [worker_id, until, stage, now] + item_ids,
+        )
+        # ...and create the missing ones; a live lease makes its row a no-op
+        cursor.execute(
+            "INSERT INTO work_leases (stage, item_id, worker_id, leased_until) VALUES "
+            + ", ".join(["(%s, %s, %s, %s)"] * len(item_ids))
+            + " ON DUPLICATE KEY UPDATE item_id = item_id",
+            [v for item_id in item_ids for v in (stage, item_id, worker_id, until)],
+        )
+        cursor.execute(
+            f"SELECT item_id FROM work_leases WHERE stage = %s AND worker_id = %s "
+            f"AND leased_until >= %s AND item_id IN ({placeholders})",
+            [stage, worker_id, now] + item_ids,
+        )
+        held = {row[0] for row in cursor.fetchall()}
+
+        if pending_sql and held:
+            held_ids = list(held)
+            cursor.execute(pending_sql.format(ids=", ".join(["%s"] * len(held_ids))), held_ids)
+            pending = {row[0] for row in cursor.fetchall()}
+            done = [item_id for item_id in held_ids if item_id not in pending]
+            if done:
+                cursor.execute(
+                    f"DELETE FROM work_leases WHERE stage = %s AND worker_id = %s "
+                    f"AND item_id IN ({', '.join(['%s'] * len(done))})",
+                    [stage, worker_id] + done,
+                )
+            held = pending & held
+        conn.commit()
+    finally:
+        cursor.close()
+    return [item_id for item_id in item_ids if item_id in held]
+
+
+def release(conn, stage, item_ids, worker_id=WORKER_ID):
+    """
+    Drop this worker's leases once the items are done. Leases on items that
+    failed can be left to expire, which doubles as a retry back-off.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(item_ids))
+    cursor = conn.cursor()
+    cursor.execute(
+        f"DELETE FROM work_leases WHERE stage = %s AND worker_id = %s AND item_id IN ({placeholders})",
+        [stage, worker_id] + item_ids,
+    )
+    conn.commit()
+    cursor.close()
+
+
+def purge_expired(conn, older_than=24 * 3600):
+    # Housekeeping: forget leases that expired long ago
+    cursor = conn.cursor()
+    cursor.execute(
+        "DELETE FROM work_leases WHERE leased_until < %s",
+        (int(time.time()) - older_than,),
+    )
+    conn.commit()
+    cursor.close()
+
+
+def not_leased_sql(stage, id_column):
+    """
+    SQL fragment for a WHERE clause that skips rows under a live lease, so
+    concurrent workers start from different rows instead of racing for the
+    same ones. Takes one parameter: the current epoch time.
+    """
+    return (
+        f"NOT EXISTS (SELECT 1 FROM work_leases wl WHERE wl.stage = '{stage}' "
+        f"AND wl.item_id = {id_column} AND wl.leased_until >= %s)"
+    )
@@ -0,0 +1,138 @@
+"""
+Parity check + micro-benchmark for the HTML cleaning backends.
+
+    python -m fetch.bench_extractors [page.html | dir_of_pages ...] [--rounds N]
+
+Every page is cleaned with each backend; any page whose text differs from the
+bs4 output is reported and the script exits non-zero. Then pages/second is
+printed per backend.
+
+With no paths the pages in the local page cache (PAGE_CACHE_DIR) are used, i.e.
+the real pages the fetcher downloaded; if the cache is empty, the built-in
+samples. The built-in malformed samples (MALFORMED_PAGES) are always checked
+too: they show the known differences between the backends (see
+clean_article_html) and are reported but don't fail the run.
+"""
+import os
+import sys
+import time
+
+from fetch import page_cache
+from fetch.content_extractor import clean_article_html, _lxml_html
+
+BACKENDS = ["bs4", "lxml"]
+
+SAMPLE_PAGES = {
+    "substack_article": """
+        <html><head><title>Post</title><meta name="generator" content="Substack"></head>
+        <body><nav><p>Subscribe</p></nav>
+        <article>
+          <h1>The   Big Title</h1>
+          <p>First paragraph with <a href="#">a link</a> and <em>emphasis</em>.</p>
+          <h2>Section two</h2>
+          <p>  Spaced
+             out   text &amp; entities &mdash; here.</p>
+          <p></p>
+          <p>Numbers 2025 and <script>var x = 1;</script>code.</p>
+          <p>Get the app to keep reading</p>
+          <p>Never reached</p>
+        </article></body></html>
+    """,
+    "no_article_tag": """
+        <html><body>
+          <h3>Heading three</h3>
+          <div><p>Para one.</p><p>Para <b>two</b>.</p></div>
+          <p>Please turn on JavaScript</p>
+        </body></html>
+    """,
+    "empty": "",
+    "unicode": """
+        <html><body><article><h2>Ünïcödé</h2><p>Café — naïve “quotes”</p></article></body></html>
+    """,
+}
+
+
+# Unclosed and mis-nested blocks: html.parser and lxml build different trees
+MALFORMED_PAGES = {
+    "unclosed_p": "<html><body><article><p>one<p>two</article></body></html>",
+    "div_inside_p": "<html><body><p>Para<div>inner</div>tail</p></body></html>",
+    "p_inside_heading": "<html><body><article><h2>Head <p>x</p></h2><p>After</p></article></body></html>",
+    "unclosed_heading": "<html><body><article><h2>Title<p>a<p>b</article></body></html>",
+}
+
+
+def load_pages(paths):
+    if not paths:
+        pages = {e["url"]: e["html"] for e in page_cache.iter_entries() if e.get("html")}
+        if pages:
+            print(f"[INFO] Using the page cache ({page_cache.PAGE_CACHE_DIR})")
+            return pages
+        print("[INFO] Page cache is empty; using the built-in sample pages")
+        return SAMPLE_PAGES
+
+    pages = {}
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith((".html", ".htm"))]
+        for f in files:
+            with open(f, encoding="utf-8", errors="replace") as fh:
+                pages[f] = fh.read()
+    return pages
+
+
+def check_parity(pages):
+    # Returns the number of pages on which a backend's text differs from bs4
+    mismatches = 0
+    for name, html in pages.items():
+        expected = clean_article_html(html, backend="bs4")
+        for backend in BACKENDS[1:]:
+            got = clean_article_html(html, backend=backend)
+            if got != expected:
+                mismatches += 1
+                print(f"[MISMATCH] {backend} on {name}")
+                for i, (a, b) in enumerate(zip(expected.splitlines(), got.splitlines())):
+                    if a != b:
+                        print(f"    line {i}: bs4={a[:120]!r}")
+                        print(f"    line {i}: {backend}={b[:120]!r}")
+                        break
+    return mismatches
+
+
+def benchmark(pages, rounds):
+    for backend in BACKENDS:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for html in pages.values():
+                clean_article_html(html, backend=backend)
+        elapsed = time.perf_counter() - started
+        total = rounds * len(pages)
+        print(f"{backend:5}  {total / elapsed:9.1f} pages/s  ({total} pages in {elapsed:.2f}s)")
+
+
+def main(argv):
+    rounds = 20
+    if "--rounds" in argv:
+        i = argv.index("--rounds")
+        rounds = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+
+    if _lxml_html is None:
+        print("[ERROR] lxml is not installed (pip install lxml)")
+        return 2
+
+    pages = load_pages(argv)
+    print(f"[INFO] {len(pages)} page(s)")
+
+    mismatches = check_parity(pages)
+    print(f"[INFO] parity: {len(pages) - mismatches}/{len(pages)} identical")
+
+    known = check_parity(MALFORMED_PAGES)
+    print(f"[INFO] malformed samples: {known}/{len(MALFORMED_PAGES)} differ (known, not counted)")
+
+    benchmark(pages, rounds)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,52 +1,221 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import threading
+import time
 
-def fetch_full_article_text(url, return_html=False):
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/114.0.0.0 Safari/537.36"
-            )
-        }
-
-        response = requests.get(url, timeout=10, headers=headers)
-        response.raise_for_status()
+from fetch import page_cache
+from config.fetch_config import (
+    EXTRACT_MAX_WORKERS,
+    EXTRACT_TIMEOUT,
+    EXTRACT_DEADLINE,
+    HTTP_POOL_SIZE,
+    EXTRACT_BACKEND,
+    EXTRACT_MAX_BYTES,
+    EXTRACT_STOP_AFTER_ARTICLE,
+)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # lxml is optional; clean_article_html falls back to bs4
+    _lxml_html = None
 
-        if return_html:
-            return str(soup)
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36"
+    )
+}
 
-        # Prefer <article>, fallback to all <p>
-        article_tag = soup.find("article")
-        elements = article_tag.find_all(["h1", "h2", "h3", "p"]) if article_tag else soup.find_all(["h1", "h2", "h3", "p"])
 
-        clean_parts = []
-        for el in elements:
-            text = el.get_text(strip=True)
+def _build_session():
+    # One keep-alive pool shared by every extractor thread
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+_session = _build_session()
+
+
+def iter_full_article_texts(urls, max_workers=EXTRACT_MAX_WORKERS):
+    """
+    Extract many pages in parallel (bounded by max_workers), yielding
+    (index into urls, text) as each page finishes so callers can store
+    results while the rest are still downloading. Failures come back as "".
+    """
+    urls = list(urls)
+    if not urls:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = {pool.submit(fetch_full_article_text, u): i for i, u in enumerate(urls)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+    finally:
+        # If the consumer stops early, don't start pages nobody will read
+        pool.shutdown(wait=True, cancel_futures=True)
 
-            # Stop if footer/junk text appears
-            if any(footer_phrase in text for footer_phrase in [
-                "JavaScript", "Substack", "turn on JavaScript", "Get the app"
-            ]):
-                break
 
-            if text:
-                if el.name in ["h1", "h2", "h3"]:
-                    clean_parts.append(f"\n{text.upper()}\n")  # Emphasize headings
-                else:
-                    clean_parts.append(text)
+def fetch_full_article_text(url, return_html=False):
+    try:
+        if return_html:
+            return str(BeautifulSoup(download_page(url, stop_after_article=False), "html.parser"))
 
-        # Join and remove excessive spaces/newlines
-        full_text = "\n".join(clean_parts)
-        full_text = re.sub(r'\n\s*\n+', '\n\n', full_text)  # collapse multiple blank lines
-        full_text = re.sub(r'[ \t]+', ' ', full_text)       # collapse extra spaces
+        cached = page_cache.get(url)
+        if cached is not None:
+            return cached["text"]
 
-        return full_text.strip()
+        html = download_page(url)
+        text = clean_article_html(html)
+        page_cache.put(url, html, text)
+        return text
 
     except Exception as e:
         print(f"Error fetching full article from {url}: {e}")
         return ""
+
+
+# ------------------ Streaming download ------------------
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+ARTICLE_START = b"<article"
+ARTICLE_END = b"</article>"
+
+
+def download_page(url, stop_after_article=EXTRACT_STOP_AFTER_ARTICLE):
+    """
+    Stream a page and return its HTML as text.
+
+    - Rejects responses whose Content-Type isn't HTML before reading the body.
+    - Stops reading at EXTRACT_MAX_BYTES.
+    - Gives up once EXTRACT_DEADLINE seconds have passed in total: the
+      requests timeout only bounds the connect and each single read, so a
+      server trickling bytes could otherwise hold a worker indefinitely.
+    - With stop_after_article, stops once the first <article> has
+      been closed: the cleaner only reads that first <article>, so the
+      footer and everything after it never needs downloading.
+    """
+    deadline = time.monotonic() + EXTRACT_DEADLINE
+    with _session.get(url, timeout=EXTRACT_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise ValueError(f"not an HTML page (Content-Type: {content_type})")
+
+        chunks = []
+        size = 0
+        opened = closed = 0
+        tail = b""   # last bytes of the previous chunk, so split tags are still seen
+        for chunk in response.iter_content(chunk_size=16384):
+            if time.monotonic() > deadline:
+                raise requests.exceptions.Timeout(f"{url} not downloaded within {EXTRACT_DEADLINE}s")
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= EXTRACT_MAX_BYTES:
+                print(f"[WARN] {url} exceeds {EXTRACT_MAX_BYTES} bytes; truncated")
+                break
+
+            if stop_after_article:
+                window = (tail + chunk).lower()
+                # a tag that fits entirely inside tail was already counted last time
+                opened += window.count(ARTICLE_START) - tail.count(ARTICLE_START)
+                closed += window.count(ARTICLE_END)
+                if opened and closed >= opened:
+                    break
+                tail = window[-(len(ARTICLE_END) - 1):]
+
+        body = b"".join(chunks)[:EXTRACT_MAX_BYTES]
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+
+# ------------------ HTML -> clean text ------------------
+FOOTER_PHRASES = ["JavaScript", "Substack", "turn on JavaScript", "Get the app"]
+TEXT_TAGS = ["h1", "h2", "h3", "p"]
+HEADING_TAGS = ["h1", "h2", "h3"]
+
+
+def clean_article_html(html, backend=None):
+    """
+    Turn a page's HTML into the cleaned article text.
+    backend: "bs4" (BeautifulSoup html.parser) or "lxml"; defaults to EXTRACT_BACKEND.
+    lxml is several times faster. Both give the same text for well-formed
+    markup, but they build different trees from malformed HTML:
+      - unclosed <p>: html.parser nests the following paragraphs inside it,
+        so "<p>one<p>two" gives "onetwo" + "two" with bs4, "one" + "two" with lxml
+      - a block (<div>, <p>) inside <p> or <h1>-<h3>: lxml closes the outer
+        tag there, dropping the inner/trailing text from it; bs4 keeps it
+    Run python -m fetch.bench_extractors on real pages before switching.
+    """
+    backend = backend or EXTRACT_BACKEND
+    if backend == "lxml" and _lxml_html is not None:
+        elements = _elements_lxml(html)
+    else:
+        elements = _elements_bs4(html)
+    return _join_clean_parts(elements)
+
+
+def _elements_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Prefer <article>, fallback to all <p>
+    article_tag = soup.find("article")
+    elements = article_tag.find_all(TEXT_TAGS) if article_tag else soup.find_all(TEXT_TAGS)
+    for el in elements:
+        yield el.name, el.get_text(strip=True)
+
+
+def _elements_lxml(html):
+    if not html or not html.strip():
+        return
+    if isinstance(html, str):
+        # lxml refuses str input that carries an <?xml encoding=...?> declaration
+        html = html.encode("utf-8")
+    root = _lxml_html.document_fromstring(html, parser=_lxml_parser())
+
+    # Prefer <article>, fallback to all <p>
+    article_tag = next(root.iter("article"), None)
+    scope = article_tag if article_tag is not None else root
+    for el in scope.iter(*TEXT_TAGS):
+        # Same as bs4 get_text(strip=True): strip each text node, drop empties, no separator
+        yield el.tag, "".join(t.strip() for t in el.xpath(_LXML_TEXT_XPATH))
+
+
+# bs4 leaves script/style/template strings out of get_text(); so do we
+_LXML_TEXT_XPATH = ".//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]"
+_lxml_parsers = threading.local()
+
+
+def _lxml_parser():
+    # lxml parsers aren't thread-safe; keep one per extractor thread
+    if not hasattr(_lxml_parsers, "parser"):
+        _lxml_parsers.parser = _lxml_html.HTMLParser(encoding="utf-8")
+    return _lxml_parsers.parser
+
+
+def _join_clean_parts(elements):
+    clean_parts = []
+    for name, text in elements:
+        # Stop if footer/junk text appears
+        if any(footer_phrase in text for footer_phrase in FOOTER_PHRASES):
+            break
+
+        if text:
+            if name in HEADING_TAGS:
+                clean_parts.append(f"\n{text.upper()}\n")  # Emphasize headings
+            else:
+                clean_parts.append(text)
+
+    # Join and remove excessive spaces/newlines
+    full_text = "\n".join(clean_parts)
+    full_text = re.sub(r'\n\s*\n+', '\n\n', full_text)  # collapse multiple blank lines
+    full_text = re.sub(r'[ \t]+', ' ', full_text)       # collapse extra spaces
+
+    return full_text.strip()
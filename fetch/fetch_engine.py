@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from config.fetch_config import FETCH_MAX_WORKERS, FETCH_PER_HOST_LIMIT
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower().replace("www.", "")
+
+
+def interleave_by_host(jobs, url_of):
+    """
+    Round-robin the jobs across hosts so that one host with many feeds
+    (e.g. substack.com) doesn't hog the front of the queue and leave
+    workers waiting on its per-host limit.
+    """
+    by_host = OrderedDict()
+    for job in jobs:
+        by_host.setdefault(host_of(url_of(job)), []).append(job)
+
+    ordered = []
+    queues = list(by_host.values())
+    while queues:
+        for q in queues:
+            ordered.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return ordered
+
+
+def run_feed_jobs(jobs, handler, url_of, max_workers=FETCH_MAX_WORKERS,
+                  per_host_limit=FETCH_PER_HOST_LIMIT):
+    """
+    Run handler(job) for every job on a thread pool.
+
+    - At most `max_workers` jobs run at once overall.
+    - At most `per_host_limit` jobs run at once against the same host.
+    - An exception in one job is printed and recorded; it never stops the others.
+
+    Returns one result dict per job:
+      {"url", "ok", "result", "error", "seconds"}
+    """
+    host_sems = {}
+    sems_guard = threading.Lock()
+
+    def host_semaphore(url):
+        host = host_of(url)
+        with sems_guard:
+            if host not in host_sems:
+                host_sems[host] = threading.BoundedSemaphore(per_host_limit)
+            return host_sems[host]
+
+    def run_one(job):
+        url = url_of(job)
+        with host_semaphore(url):
+            started = time.perf_counter()
+            try:
+                result = handler(job)
+                return {"url": url, "ok": True, "result": result, "error": None,
+                        "seconds": time.perf_counter() - started}
+            except Exception as e:
+                print(f"❌ Error fetching from {url}: {e}")
+                return {"url": url, "ok": False, "result": None, "error": str(e),
+                        "seconds": time.perf_counter() - started}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(run_one, job) for job in interleave_by_host(jobs, url_of)]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    return results
+
+
+def print_fetch_summary(results, wall_seconds):
+    """
+    Per-feed wall time (slowest first) plus the overall speedup versus
+    polling the same feeds one after another.
+    """
+    if not results:
+        print("[INFO] No feeds fetched.")
+        return
+
+    print("\n---- Fetch summary (slowest first) ----")
+    for r in sorted(results, key=lambda r: r["seconds"], reverse=True):
+        status = "ok" if r["ok"] else "FAILED"
+        print(f"{r['seconds']:7.2f}s  {status:6}  {r['url']}")
+
+    sequential = sum(r["seconds"] for r in results)
+    failed = sum(1 for r in results if not r["ok"])
+    speedup = sequential / wall_seconds if wall_seconds > 0 else 0.0
+    print(
+        f"[INFO] {len(results)} feed(s), {failed} failed | wall {wall_seconds:.2f}s "
+        f"vs {sequential:.2f}s sequential ({speedup:.1f}x)"
+    )
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from config.fetch_config import (
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_DIR,
+    PAGE_CACHE_TTL,
+    PAGE_CACHE_MAX_MB,
+)
+
+# Local cache of downloaded article pages, keyed by sha256(url).
+# Each entry is one zlib-compressed JSON file holding the raw HTML and the
+# cleaned text. A file's mtime is its last use, which drives LRU eviction.
+
+_stats = {"hits": 0, "misses": 0, "writes": 0}
+_stats_lock = threading.Lock()
+
+
+def _path(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(PAGE_CACHE_DIR, key[:2], key + ".zz")
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get(url):
+    """
+    Returns {"url", "fetched_at", "html", "text"} or None on a miss / expired entry.
+    """
+    if not PAGE_CACHE_ENABLED or not url:
+        return None
+
+    path = _path(url)
+    try:
+        with open(path, "rb") as fh:
+            entry = json.loads(zlib.decompress(fh.read()))
+    except (OSError, ValueError, zlib.error):
+        _count("misses")
+        return None
+
+    if entry.get("url") != url or time.time() - entry.get("fetched_at", 0) > PAGE_CACHE_TTL:
+        _count("misses")
+        return None
+
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        pass
+    _count("hits")
+    return entry
+
+
+def put(url, html, text):
+    if not PAGE_CACHE_ENABLED or not url:
+        return
+
+    path = _path(url)
+    entry = {"url": url, "fetched_at": time.time(), "html": html, "text": text}
+    data = zlib.compress(json.dumps(entry).encode("utf-8"), 6)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write + rename so concurrent readers never see a half-written file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        _count("writes")
+    except OSError as e:
+        print(f"[WARN] Could not cache {url}: {e}")
+
+
+def evict():
+    """
+    Drop expired entries, then the least recently used ones until the cache
+    fits in PAGE_CACHE_MAX_MB. Returns the number of files removed.
+    """
+    if not PAGE_CACHE_ENABLED or not os.path.isdir(PAGE_CACHE_DIR):
+        return 0
+
+    now = time.time()
+    files = []
+    for root, _, names in os.walk(PAGE_CACHE_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+    removed = 0
+    kept = []
+    for mtime, size, path in files:
+        # Stale temp files and entries past their TTL. mtime only moves forward
+        # on use, so an unused entry older than the TTL is certainly expired.
+        if path.endswith(".tmp") or now - mtime > PAGE_CACHE_TTL:
+            removed += _remove(path)
+        else:
+            kept.append((mtime, size, path))
+
+    total = sum(size for _, size, _ in kept)
+    limit = PAGE_CACHE_MAX_MB * 1024 * 1024
+    for mtime, size, path in sorted(kept):
+        if total <= limit:
+            break
+        removed += _remove(path)
+        total -= size
+
+    return removed
+
+
+def iter_entries():
+    """
+    Yields every readable cache entry ({"url", "fetched_at", "html", "text"}),
+    expired or not, without touching mtimes or stats. For offline tools such
+    as fetch/bench_extractors.py.
+    """
+    if not os.path.isdir(PAGE_CACHE_DIR):
+        return
+    for root, _, names in os.walk(PAGE_CACHE_DIR):
+        for name in sorted(names):
+            if not name.endswith(".zz"):
+                continue
+            try:
+                with open(os.path.join(root, name), "rb") as fh:
+                    yield json.loads(zlib.decompress(fh.read()))
+            except (OSError, ValueError, zlib.error):
+                continue
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
+
+
+def stats():
+    with _stats_lock:
+        s = dict(_stats)
+    lookups = s["hits"] + s["misses"]
+    s["hit_rate"] = s["hits"] / lookups if lookups else 0.0
+    return s
+
+
+def print_cache_stats():
+    if not PAGE_CACHE_ENABLED:
+        return
+    s = stats()
+    print(
+        f"[INFO] Page cache: {s['hits']} hit(s), {s['misses']} miss(es) "
+        f"({s['hit_rate']:.0%} hit rate), {s['writes']} write(s)"
+    )
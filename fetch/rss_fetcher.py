@@ -1,11 +1,67 @@
+import calendar
 import feedparser
-from fetch.content_extractor import fetch_full_article_text
+from fetch.content_extractor import iter_full_article_texts, clean_article_html
+from config.fetch_config import USE_FEED_CONTENT, FEED_CONTENT_MIN_CHARS
 from fetch.fields_fetcher import compute_source_other, pretty_date_from_entry
 
 
 def fetch_rss_feed(url: str):
-    feed = feedparser.parse(url)
-    articles = []
+    return list(poll_feed(url)["articles"])
+
+
+def poll_feed(url: str, etag=None, modified=None, is_known=None):
+    """
+    Conditional GET of a feed. Pass the ETag / Last-Modified from the last
+    poll; a 304 means nothing changed and no entries are processed.
+
+    is_known(link) -> bool lets the caller skip entries that are already
+    stored, before their page is downloaded and extracted.
+
+    Returns:
+      {"not_modified": bool, "etag": str|None, "modified": str|None,
+       "published": [epoch seconds of every entry's publish date], "articles": iterator}
+
+    "articles" is lazy: each article is yielded as soon as its content is
+    ready (feed-embedded bodies first, then scraped pages as they finish),
+    so the caller can insert while the rest are still being extracted.
+    """
+    feed = feedparser.parse(url, etag=etag, modified=modified)
+
+    status = getattr(feed, "status", None)
+    if status == 304:
+        return {"not_modified": True, "etag": etag, "modified": modified,
+                "published": [], "articles": iter(())}
+
+    # No HTTP status means the request itself failed, and a 4xx/5xx carries no
+    # validators for the feed; either way keep the old ones
+    if status is None or status >= 400:
+        if status is not None:
+            print(f"[WARN] {url} returned HTTP {status}")
+        return {"not_modified": False, "etag": etag, "modified": modified,
+                "published": entry_publish_times(feed),
+                "articles": iter_feed_articles(feed, is_known)}
+
+    return {
+        "not_modified": False,
+        "etag": getattr(feed, "etag", None),
+        "modified": getattr(feed, "modified", None),
+        "published": entry_publish_times(feed),
+        "articles": iter_feed_articles(feed, is_known),
+    }
+
+
+def entry_publish_times(feed):
+    # Publish (or update) time of every entry, as UTC epoch seconds
+    times = []
+    for entry in feed.entries:
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        if parsed:
+            times.append(calendar.timegm(parsed))
+    return times
+
+
+def iter_feed_articles(feed, is_known=None):
+    to_scrape = []
 
     feed_title = None
     try:
@@ -17,6 +73,9 @@ def fetch_rss_feed(url: str):
         short_title = (entry.get("title") or "").strip()
         link = (entry.get("link") or "").strip()
 
+        if is_known and is_known(link):
+            continue
+
         # Collect all authors if present
         author = ""
         try:
@@ -38,21 +97,54 @@ def fetch_rss_feed(url: str):
             entry.get("published") or entry.get("updated")
         )
 
-        # Fetch full, cleaned article content
-        content = fetch_full_article_text(link)
-
-        articles.append({
+        article = {
             "short_title": short_title,
             "url": link,
             "source": "Other",                                 # per your requirement
             "source_other": compute_source_other(feed_title, link),
             "author": author,
-            "content": content,
+            "content": inline_feed_content(entry),             # None -> scraped below
             "summary": None,                                   # filled later by summarizer
             "category": None,                                  # filled later by categorizer
             "more_than_1": 0,                                  # per your requirement
             "date": date_display, 
             "hub" : None                                                          # string like "August 03, 2025"
-        })
+        }
+
+        if article["content"] is None:
+            to_scrape.append(article)
+        else:
+            yield article
+
+    # Fetch full, cleaned article content in parallel for entries the feed didn't carry
+    for i, content in iter_full_article_texts([a["url"] for a in to_scrape]):
+        article = to_scrape[i]
+        to_scrape[i] = None  # drop our reference once handed over
+        article["content"] = content
+        yield article
+
+
+# Endings that mark a feed body as a teaser rather than the full post
+TRUNCATION_MARKERS = ("…", "...", "read more", "continue reading", "keep reading", "read the full")
+
+
+def inline_feed_content(entry):
+    """
+    Clean the entry's embedded body (content:encoded) the same way the page
+    scraper does. Returns it only if it looks like the complete post,
+    otherwise None so the page gets scraped.
+    """
+    if not USE_FEED_CONTENT:
+        return None
+
+    bodies = [c.get("value") or "" for c in (entry.get("content") or [])]
+    html = max(bodies, key=len, default="")
+    if not html:
+        return None
 
-    return articles
\ No newline at end of file
+    text = clean_article_html(html)
+    if len(text) < FEED_CONTENT_MIN_CHARS:
+        return None
+    if text.rstrip().lower().endswith(TRUNCATION_MARKERS):
+        return None
+    return text
\ No newline at end of file
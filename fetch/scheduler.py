@@ -0,0 +1,128 @@
+import calendar
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from db.feed_repository import (
+    get_all_active_feeds,
+    group_feeds_by_url,
+    get_feed_schedules,
+    update_feed_schedule,
+)
+from fetch.fetch_engine import run_feed_jobs, print_fetch_summary
+from fetch import page_cache
+from config.fetch_config import (
+    POLL_MIN_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_DEFAULT_INTERVAL,
+    POLL_GAP_FACTOR,
+    POLL_BACKOFF,
+    POLL_JITTER,
+    SCHEDULER_TICK,
+    SCHEDULER_REFRESH,
+)
+
+# How many of the most recent posts to learn a feed's cadence from
+CADENCE_WINDOW = 10
+
+
+def clamp_interval(seconds):
+    return int(min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, seconds)))
+
+
+def estimate_interval(published, current_interval, got_new):
+    """
+    Next polling interval for a feed, in seconds.
+
+    - With publish history: a fraction (POLL_GAP_FACTOR) of the median gap
+      between its recent posts, blended with the current interval so one
+      odd post doesn't swing it.
+    - Without history: back off when the poll brought nothing new, keep the
+      interval otherwise.
+    """
+    current = current_interval or POLL_DEFAULT_INTERVAL
+
+    recent = sorted(set(published), reverse=True)[:CADENCE_WINDOW]
+    gaps = [a - b for a, b in zip(recent, recent[1:]) if a > b]
+    if gaps and got_new:
+        learned = statistics.median(gaps) * POLL_GAP_FACTOR
+        return clamp_interval((learned + current) / 2)
+
+    if not got_new:
+        return clamp_interval(current * POLL_BACKOFF)
+    return clamp_interval(current)
+
+
+def jittered(seconds):
+    return seconds * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+
+def to_db_time(epoch):
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def from_db_time(value):
+    # DATETIME columns come back as naive datetimes holding UTC
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    return calendar.timegm(value.timetuple())
+
+
+def run_scheduler(handler, known_urls):
+    """
+    Long-running poll loop. Every SCHEDULER_TICK seconds, feeds whose
+    next poll time has passed are fetched with handler(feed, known_urls)
+    on the fetch engine. Each feed's next poll is then set from its learned
+    cadence and stored on its rss_feeds row.
+
+    handler must return {"new": int, "published": [epoch, ...]}, as
+    main.fetch_and_store_feed does.
+    """
+    feeds = {}
+    schedule = {}          # feed_url -> (interval, next_poll_epoch)
+    last_refresh = 0
+
+    print("[INFO] Scheduler started")
+    while True:
+        now = time.time()
+
+        if now - last_refresh >= SCHEDULER_REFRESH:
+            feeds = {f["feed_url"]: f for f in group_feeds_by_url(get_all_active_feeds())}
+            stored = get_feed_schedules()
+            for url in feeds:
+                interval, next_at = stored.get(url, (None, None))
+                old = schedule.get(url)
+                schedule[url] = (
+                    interval or (old[0] if old else None),
+                    from_db_time(next_at) or (old[1] if old else now),
+                )
+            for url in list(schedule):
+                if url not in feeds:
+                    del schedule[url]
+            last_refresh = now
+            print(f"[INFO] Scheduler tracking {len(feeds)} feed(s)")
+
+        due = [feeds[url] for url, (_, next_at) in schedule.items() if next_at <= now]
+        if due:
+            started = time.perf_counter()
+            results = run_feed_jobs(
+                due,
+                lambda feed: handler(feed, known_urls),
+                url_of=lambda feed: feed["feed_url"],
+            )
+            print_fetch_summary(results, time.perf_counter() - started)
+            page_cache.evict()
+
+            for r in results:
+                interval, _ = schedule[r["url"]]
+                polled = r["result"] or {"new": 0, "published": []}
+                interval = estimate_interval(polled["published"], interval, polled["new"] > 0)
+                next_at = time.time() + jittered(interval)
+                schedule[r["url"]] = (interval, next_at)
+                update_feed_schedule(r["url"], interval, to_db_time(next_at))
+
+        next_due = min((next_at for _, next_at in schedule.values()), default=now + SCHEDULER_TICK)
+        time.sleep(max(1, min(SCHEDULER_TICK, next_due - time.time())))
@@ -1,16 +1,16 @@
-import mysql.connector
-from config.db_config import DB_CONFIG
+from db.connection import get_connection
+from db.body_store import decompress_body
 
 def show_all_articles_content():
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT content FROM articles")
+        cursor.execute("SELECT body FROM article_bodies ORDER BY article_id")
         rows = cursor.fetchall()
 
-        for i, (content,) in enumerate(rows, 1):
-            print(content)  # Print raw content only
+        for i, (body,) in enumerate(rows, 1):
+            print(decompress_body(body))  # Print raw content only
 
     except Exception as e:
         print(f"❌ Error: {e}")
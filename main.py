@@ -1,26 +1,107 @@
-from db.feed_repository import get_all_active_feeds
-from fetch.rss_fetcher import fetch_rss_feed
-from db.article_repository import insert_article
+from db.feed_repository import get_all_active_feeds, group_feeds_by_url, update_feed_validators
+from fetch.rss_fetcher import poll_feed
+from db.article_repository import insert_articles, load_known_urls
 from summarize.summarize_articles import summarize_and_store_all_articles
 from db.populate_wp_post_ids import populate_wp_post_ids
+from fetch.fetch_engine import run_feed_jobs, print_fetch_summary
+from fetch import page_cache
+from config.fetch_config import FETCH_INSERT_BATCH
+from fetch.scheduler import run_scheduler
+from db.connection import print_pool_stats
+import sys
+import time
+
+
+def fetch_and_store_feed(feed, known_urls):
+    hubs = [target["hub_name"] for target in feed["targets"]]
+
+    def is_known(link):
+        # Only skip the download if every hub carrying this feed has it already
+        return all((hub, link) in known_urls for hub in hubs)
+
+    polled = poll_feed(
+        feed["feed_url"],
+        etag=feed["etag"],
+        modified=feed["last_modified"],
+        is_known=is_known,
+    )
+    if polled["not_modified"]:
+        return {"new": 0, "published": []}
+
+    # Fetch + extract once, then stamp a copy for every hub the feed maps to.
+    # Articles stream in as they're extracted and are stored in small batches.
+    count = inserted = skipped = failed = 0
+    batch, queued = [], set()
+
+    def store(batch):
+        nonlocal inserted, skipped, failed
+        ins, skip, fail = insert_articles(batch)
+        inserted, skipped, failed = inserted + ins, skipped + skip, failed + fail
+        # Only remember URLs that are really stored; failed ones are retried next poll
+        if not fail:
+            known_urls.update((a["hub_name"], a["url"]) for a in batch)
+
+    for article in polled["articles"]:
+        count += 1
+        for target in feed["targets"]:
+            key = (target["hub_name"], article["url"])
+            if key in known_urls or key in queued:
+                continue
+            queued.add(key)
+
+            hub_article = dict(article)
+            hub_article["feed_id"] = target["feed_id"]
+            hub_article["category"] = target["category"]
+            hub_article["hub_name"] = target["hub_name"]
+            batch.append(hub_article)
+
+        if len(batch) >= FETCH_INSERT_BATCH:
+            store(batch)
+            batch = []
+    store(batch)
+    if skipped or failed:
+        print(f"[INFO] {feed['feed_url']}: {inserted} inserted, {skipped} duplicate(s) skipped, {failed} failed")
+
+    # Only remember the validators once every entry is stored; after a failed
+    # insert the next poll must fetch the feed again instead of getting a 304
+    if failed:
+        print(f"[WARN] {feed['feed_url']}: keeping the old ETag/Last-Modified so failed entries are retried")
+    elif polled["etag"] != feed["etag"] or polled["modified"] != feed["last_modified"]:
+        update_feed_validators(feed["feed_url"], polled["etag"], polled["modified"])
+        # keep the in-memory copy current for the scheduler's next poll
+        feed["etag"], feed["last_modified"] = polled["etag"], polled["modified"]
+    return {"new": count, "published": polled["published"]}
 
 
 def fetch_and_store_all():
-    feeds = get_all_active_feeds()
+    feeds = group_feeds_by_url(get_all_active_feeds())
+    known_urls = load_known_urls()
+    print(f"[INFO] {len(known_urls)} known article URL(s) loaded")
+
+    started = time.perf_counter()
+    results = run_feed_jobs(
+        feeds,
+        lambda feed: fetch_and_store_feed(feed, known_urls),
+        url_of=lambda feed: feed["feed_url"],
+    )
+    print_fetch_summary(results, time.perf_counter() - started)
+
+    page_cache.print_cache_stats()
+    page_cache.evict()
 
-    for feed_id, url, feed_name, feed_category, hub_name in feeds:
-        try:
-            articles = fetch_rss_feed(url)
-            for article in articles:
-                article["feed_id"] = feed_id
-                article["category"] = feed_category
-                article["hub_name"] = hub_name
-                insert_article(article)
-        except Exception as e:
-            print(f"❌ Error fetching from {url}: {e}")
+
+def run_fetch_daemon():
+    # Poll feeds continuously, each on its own learned cadence (STEP 1 only)
+    known_urls = load_known_urls()
+    print(f"[INFO] {len(known_urls)} known article URL(s) loaded")
+    run_scheduler(fetch_and_store_feed, known_urls)
 
 
 def main():
+    if "--daemon" in sys.argv[1:]:
+        run_fetch_daemon()
+        return
+
     print(" STEP 1: Fetch RSS Feeds ")
     fetch_and_store_all()
 
@@ -32,6 +113,8 @@ def main():
     print(" STEP 3: Populate WP Post IDs for all posts ")
     populate_wp_post_ids()
 
+    print_pool_stats()
+
 
 
 if __name__ == "__main__":
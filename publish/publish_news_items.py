@@ -2,11 +2,12 @@
 
 import re
 import requests
-import mysql.connector
 import datetime
+import time
 from requests.auth import HTTPBasicAuth
 
-from config.db_config import DB_CONFIG
+from db.connection import get_connection
+from db.work_queue import claim, release, not_leased_sql
 from config.wp_config import (
     WP_DEFAULT_USER,
     WP_DEFAULT_PASS,
@@ -19,6 +20,17 @@ from publish.push_news_items_to_featured_posts import (
 )
 
 
+LEASE_STAGE = "publish"
+# Ids (of "{ids}") not yet pushed to their hub; claim() drops leases on the rest,
+# so an article another publisher just posted is never posted twice
+PENDING_SQL = """
+    SELECT a.id FROM articles a
+    JOIN hubs h ON h.hub_name = a.hub_name
+    WHERE a.id IN ({ids})
+      AND NOT EXISTS (SELECT 1 FROM article_push ap WHERE ap.article_id = a.id AND ap.hub_id = h.id)
+"""
+
+
 def clean(text):
     return re.sub(r"\s+", " ", str(text)).strip() if text else ""
 
@@ -27,8 +39,9 @@ def get_pending_articles(conn, limit=BATCH_LIMIT):
     """
     Fetch articles NOT yet published to their hub.
     We detect this by checking article_push for missing wp_news_item_id.
+    Articles leased by another publisher are skipped.
     """
-    query = """
+    query = f"""
         SELECT
             a.id            AS article_id,
             a.short_title   AS short_title,
@@ -36,7 +49,6 @@ def get_pending_articles(conn, limit=BATCH_LIMIT):
             a.source        AS source,
             a.source_other  AS source_other,
             a.author        AS author,
-            a.content       AS content,
             a.summary       AS summary,
             a.category      AS category,
             a.more_than_1   AS more_than_1,
@@ -50,12 +62,13 @@ def get_pending_articles(conn, limit=BATCH_LIMIT):
           ON ap.article_id = a.id
          AND ap.hub_id = h.id
         WHERE ap.id IS NULL
+          AND {not_leased_sql(LEASE_STAGE, "a.id")}
         ORDER BY a.fetched_at ASC
         LIMIT %s
     """
 
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query, (limit,))
+    cursor.execute(query, (int(time.time()), limit))
     rows = cursor.fetchall()
     cursor.close()
     return rows
@@ -147,7 +160,7 @@ def insert_article_push(conn, row, wp_response):
 
 
 def main():
-    conn = mysql.connector.connect(**DB_CONFIG)
+    conn = get_connection()
 
     try:
         rows = get_pending_articles(conn)
@@ -156,6 +169,10 @@ def main():
             print("No pending articles to publish.")
             return
 
+        # Lease the rows so concurrent publishers never post the same article twice
+        claimed = set(claim(conn, LEASE_STAGE, [r["article_id"] for r in rows], pending_sql=PENDING_SQL))
+        rows = [r for r in rows if r["article_id"] in claimed]
+
         print(f"Found {len(rows)} article(s) to publish...")
 
         for row in rows:
@@ -166,6 +183,7 @@ def main():
                 print(f"→ Publishing article {aid} to hub {hub}...")
                 wp_result = publish_to_hub(row)
                 insert_article_push(conn, row, wp_result)
+                release(conn, LEASE_STAGE, [aid])
 
                 print(
                     f"Article {aid} → '{hub}' → WP #{wp_result.get('id')} "
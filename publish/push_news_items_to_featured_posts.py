@@ -1,14 +1,13 @@
 import requests
-import mysql.connector
 from datetime import datetime
 from requests.auth import HTTPBasicAuth
 
-from config.db_config import DB_CONFIG
+from db.connection import get_connection
 from config.wp_config import WP_DEFAULT_USER, WP_DEFAULT_PASS
 
 
 def get_db_connection():
-    return mysql.connector.connect(**DB_CONFIG)
+    return get_connection()
 
 
 def get_unpushed_featured_news_items(conn):
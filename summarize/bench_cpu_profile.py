@@ -0,0 +1,91 @@
+"""
+Latency / quality benchmark for the CPU inference profiles.
+
+    python -m summarize.bench_cpu_profile [article.txt | dir_of_txt ...] [--limit N] [--threads 2,4,8]
+
+Summarizes the same articles with the fp32 model, the int8 dynamically
+quantized one and the ONNX Runtime backend (if optimum is installed), at
+each thread count. Prints seconds per article and, for every profile, how
+close its summaries are to the fp32 baseline (mean token-overlap F1,
+1.0 = identical words). Inputs are read like summarize.bench_summarize.
+"""
+import re
+import sys
+import time
+from collections import Counter
+
+import torch
+
+from summarize.bench_summarize import load_texts
+from summarize.summarize_articles import load_model, summarize_text
+
+# (backend, quantize)
+PROFILES = [("torch", "none"), ("torch", "int8"), ("onnx", "none")]
+
+
+def overlap_f1(reference, candidate):
+    # Unigram F1 between two summaries (a ROUGE-1 style similarity score)
+    ref = Counter(re.findall(r"\w+", reference.lower()))
+    cand = Counter(re.findall(r"\w+", candidate.lower()))
+    common = sum((ref & cand).values())
+    if not common:
+        return 0.0
+    precision = common / sum(cand.values())
+    recall = common / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_profile(texts, backend, quantize, threads):
+    tokenizer, model = load_model(quantize=quantize, num_threads=threads, backend=backend)
+    summarize_text(texts[0][:2000], tokenizer, model)   # warm-up
+
+    summaries, latencies = [], []
+    for text in texts:
+        started = time.perf_counter()
+        summaries.append(summarize_text(text, tokenizer, model))
+        latencies.append(time.perf_counter() - started)
+    return summaries, latencies
+
+
+def main(argv):
+    limit = 8
+    thread_counts = [torch.get_num_threads()]
+    if "--limit" in argv:
+        i = argv.index("--limit")
+        limit = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    if "--threads" in argv:
+        i = argv.index("--threads")
+        thread_counts = [int(t) for t in argv[i + 1].split(",")]
+        argv = argv[:i] + argv[i + 2:]
+
+    texts = load_texts(argv, limit)
+    if not texts:
+        print("[ERROR] no articles to summarize")
+        return 2
+    print(f"[INFO] {len(texts)} article(s)")
+
+    baseline = None
+    for threads in thread_counts:
+        for backend, quantize in PROFILES:
+            label = backend if quantize == "none" else f"{backend}/{quantize}"
+            try:
+                summaries, latencies = run_profile(texts, backend, quantize, threads)
+            except ImportError as e:
+                print(f"{label:10} skipped: {e}")
+                continue
+            if baseline is None:
+                baseline = summaries   # fp32 at the first thread count
+            f1 = sum(overlap_f1(b, s) for b, s in zip(baseline, summaries)) / len(texts)
+            latencies.sort()
+            print(
+                f"{label:10} threads={threads:<3} "
+                f"mean {sum(latencies) / len(latencies):6.2f}s  "
+                f"median {latencies[len(latencies) // 2]:6.2f}s per article  "
+                f"F1 vs fp32 {f1:.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
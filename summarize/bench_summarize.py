@@ -0,0 +1,89 @@
+"""
+Throughput benchmark: one-at-a-time summarize_text vs batched summarize_texts.
+
+    python -m summarize.bench_summarize [article.txt | dir_of_txt ...] [--limit N] [--batch-sizes 1,4,8,16]
+
+With no paths, up to --limit article bodies (default 16) are read from the
+database. Prints articles/minute for the current loop and for summarize_texts
+at each batch size, plus how many batched summaries match the loop's word for
+word (padding can shift beam search slightly, so a few may differ).
+"""
+import os
+import sys
+import time
+
+from db.connection import get_connection
+from db.body_store import load_bodies
+from summarize.summarize_articles import load_model, summarize_text, summarize_texts
+
+
+def load_texts(paths, limit):
+    if paths:
+        texts = []
+        for path in paths:
+            files = [path]
+            if os.path.isdir(path):
+                files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".txt")]
+            for f in files:
+                with open(f, encoding="utf-8", errors="replace") as fh:
+                    texts.append(fh.read())
+        return texts[:limit]
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT body_article_id FROM canonical_articles "
+            "WHERE body_article_id IS NOT NULL ORDER BY id DESC LIMIT %s",
+            (limit,),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        bodies = load_bodies(conn, ids)
+        return [bodies[i] for i in ids if bodies.get(i)]
+    finally:
+        conn.close()
+
+
+def report(label, count, elapsed):
+    print(f"{label:12} {count * 60 / elapsed:8.1f} articles/min  ({count} in {elapsed:.1f}s)")
+
+
+def main(argv):
+    limit = 16
+    batch_sizes = [1, 4, 8, 16]
+    if "--limit" in argv:
+        i = argv.index("--limit")
+        limit = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    if "--batch-sizes" in argv:
+        i = argv.index("--batch-sizes")
+        batch_sizes = [int(b) for b in argv[i + 1].split(",")]
+        argv = argv[:i] + argv[i + 2:]
+
+    texts = load_texts(argv, limit)
+    if not texts:
+        print("[ERROR] no articles to summarize")
+        return 2
+    print(f"[INFO] {len(texts)} article(s)")
+
+    tokenizer, model = load_model()
+    # Warm-up so the first timed run doesn't pay for lazy initialisation
+    summarize_text(texts[0][:2000], tokenizer, model)
+
+    started = time.perf_counter()
+    expected = [summarize_text(t, tokenizer, model) for t in texts]
+    report("loop", len(texts), time.perf_counter() - started)
+
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        got = summarize_texts(texts, tokenizer, model, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        same = sum(1 for a, b in zip(expected, got) if a == b)
+        report(f"batch={batch_size}", len(texts), elapsed)
+        print(f"{'':12} {same}/{len(texts)} identical to loop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,226 @@
+"""
+Turn an article into the token chunks the summarizer feeds to Pegasus.
+
+Chunks end on sentence boundaries, and each article is first cut down to
+SUMMARY_TOKEN_BUDGET tokens, so the number of generate calls per article
+is bounded however long it is. With SUMMARY_EXTRACTIVE the sentences kept
+are the most salient ones (TF-IDF similarity to the whole article),
+otherwise the leading ones.
+"""
+import math
+import re
+
+import numpy as np
+
+from config.summarize_config import SUMMARY_TOKEN_BUDGET, SUMMARY_EXTRACTIVE
+
+# End of sentence: . ! ? (optionally closing quote/bracket) then space and a capital/digit/quote
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]”’]))\s+(?=["\'(“‘]?[A-Z0-9])')
+
+
+def split_sentences(text):
+    sentences = []
+    # Lines first: headings and paragraphs are their own units
+    for line in (text or "").split("\n"):
+        for sentence in _SENTENCE_END.split(line):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+def score_sentences(sentences):
+    """
+    TF-IDF salience of each sentence: cosine similarity between the
+    sentence's TF-IDF vector and the mean vector of the whole article.
+
+    Computed on the (sentence, word) entries only, never a dense
+    sentences x vocabulary matrix, so memory grows with the article's word
+    count rather than its square.
+    """
+    n = len(sentences)
+    words = [re.findall(r"\w+", s.lower()) for s in sentences]
+    vocab = {}
+    for ws in words:
+        for w in ws:
+            vocab.setdefault(w, len(vocab))
+    if not vocab:
+        return np.zeros(n)
+
+    rows = np.repeat(np.arange(n), [len(ws) for ws in words])
+    cols = np.fromiter((vocab[w] for ws in words for w in ws), dtype=np.int64, count=len(rows))
+
+    # Term counts per (sentence, word) pair
+    pairs, tf = np.unique(rows * len(vocab) + cols, return_counts=True)
+    rows, cols = pairs // len(vocab), pairs % len(vocab)
+
+    df = np.bincount(cols, minlength=len(vocab))
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = tf * idf[cols]
+    # L2-normalise each sentence (every row here has at least one entry)
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n))
+    weights = weights / norms[rows]
+
+    centroid = np.bincount(cols, weights=weights, minlength=len(vocab)) / n
+    return np.bincount(rows, weights=weights * centroid[cols], minlength=n)
+
+
+def rank_sentences(sentences, extractive=SUMMARY_EXTRACTIVE):
+    # Indexes from most to least worth keeping
+    if extractive:
+        return [int(i) for i in np.argsort(-score_sentences(sentences), kind="stable")]
+    return list(range(len(sentences)))
+
+
+def select_sentences(ranked, token_counts, budget, extractive=SUMMARY_EXTRACTIVE):
+    """
+    Indexes (in article order) of the sentences to keep within budget tokens,
+    taken in ranked order.
+    """
+    if sum(token_counts) <= budget:
+        return list(range(len(token_counts)))
+
+    keep, used = [], 0
+    for i in ranked:
+        if used + token_counts[i] <= budget:
+            keep.append(i)
+            used += token_counts[i]
+        elif not extractive:
+            break
+    return sorted(keep)
+
+
+def fill_chunks(keep, counts, room):
+    # Group the kept sentence indexes, in order, filling each chunk up to room
+    # tokens: the fewest chunks in-order packing allows
+    chunks, current, size = [], [], 0
+    for i in keep:
+        if current and size + counts[i] > room:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += counts[i]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def balance_chunks(keep, counts, room, n_chunks):
+    """
+    Regroup the kept sentence indexes into about n_chunks chunks of even
+    size, so there is no tiny leftover chunk at the end. Falls back to
+    fill_chunks if sentence boundaries would need an extra chunk.
+    """
+    # Start a new chunk when the next sentence mostly belongs past the current
+    # chunk's even share (or wouldn't fit at all)
+    per_chunk = sum(counts[i] for i in keep) / max(1, n_chunks)
+    chunks, current, size, placed = [], [], 0, 0
+    for i in keep:
+        overshoots = placed + counts[i] / 2 > per_chunk * (len(chunks) + 1)
+        if current and (overshoots or size + counts[i] > room):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += counts[i]
+        placed += counts[i]
+    if current:
+        chunks.append(current)
+    return chunks if len(chunks) <= n_chunks else fill_chunks(keep, counts, room)
+
+
+def chunk_article(text, tokenizer, max_tokens=None, budget=SUMMARY_TOKEN_BUDGET, extractive=SUMMARY_EXTRACTIVE):
+    """
+    Returns a list of token-id lists (each ending in EOS, at most max_tokens
+    long) covering the selected sentences in order. Sentences are never
+    split unless one alone is longer than a chunk.
+
+    Never more than ceil(budget / (max_tokens - 1)) chunks: when sentence
+    boundaries don't pack into that many, the lowest-ranked sentences are
+    dropped until they do.
+    """
+    max_tokens = max_tokens or tokenizer.model_max_length
+    room = max_tokens - 1   # leave space for EOS
+    max_chunks = max(1, math.ceil(budget / room))
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return [[tokenizer.eos_token_id]]
+    sentence_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+
+    # A sentence longer than a chunk (e.g. a run-on list) is cut by tokens
+    pieces, piece_texts = [], []
+    for sentence, ids in zip(sentences, sentence_ids):
+        for i in range(0, len(ids), room):
+            pieces.append(ids[i:i + room])
+            piece_texts.append(sentence)
+    counts = [len(p) for p in pieces]
+
+    ranked = rank_sentences(piece_texts, extractive) if sum(counts) > budget else list(range(len(pieces)))
+    keep = select_sentences(ranked, counts, budget, extractive)
+    filled = fill_chunks(keep, counts, room)
+
+    while len(filled) > max_chunks:
+        # Drop at least as many tokens as spilled past the last allowed chunk,
+        # lowest-ranked first, and pack again
+        overflow = sum(counts[i] for chunk in filled[max_chunks:] for i in chunk)
+        kept = set(keep)
+        dropped = 0
+        for i in reversed(ranked):
+            if dropped >= overflow:
+                break
+            if i in kept:
+                kept.discard(i)
+                dropped += counts[i]
+        keep = sorted(kept)
+        filled = fill_chunks(keep, counts, room)
+
+    groups = balance_chunks(keep, counts, room, len(filled))
+    if not groups:
+        return [[tokenizer.eos_token_id]]
+    return [[t for i in group for t in pieces[i]] + [tokenizer.eos_token_id] for group in groups]
+
+
+# ------------------ Self-check ------------------
+class _WordTokenizer:
+    # Stand-in tokenizer (one token per word) so the check runs without the model
+    model_max_length = 1024
+    eos_token_id = 1
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [[2] * len(t.split()) for t in texts]}
+
+
+def check_chunk_bounds(articles=1000, seed=0):
+    """
+    Chunk random long articles (lead and extractive selection) and count the
+    ones that break the bounds: more than ceil(budget / room) chunks, or a
+    chunk over max_tokens. Returns the number of violations.
+    """
+    import random
+
+    rng = random.Random(seed)
+    tokenizer = _WordTokenizer()
+    room = tokenizer.model_max_length - 1
+    max_chunks = math.ceil(SUMMARY_TOKEN_BUDGET / room)
+    words = [f"w{i}" for i in range(2000)]
+
+    violations = 0
+    for n in range(articles):
+        text = " ".join(
+            " ".join(rng.choice(words) for _ in range(rng.randint(3, 40))).capitalize() + "."
+            for _ in range(rng.randint(50, 400))
+        )
+        for extractive in (True, False):
+            chunks = chunk_article(text, tokenizer, extractive=extractive)
+            if len(chunks) > max_chunks or max(len(c) for c in chunks) > tokenizer.model_max_length:
+                violations += 1
+                print(f"[FAIL] article {n} extractive={extractive}: {[len(c) for c in chunks]}")
+    print(f"[INFO] {articles} article(s) x 2 modes, {violations} violation(s) "
+          f"(max {max_chunks} chunks of {tokenizer.model_max_length} tokens)")
+    return violations
+
+
+if __name__ == "__main__":
+    # python -m summarize.chunking [articles]
+    import sys
+    sys.exit(1 if check_chunk_bounds(int(sys.argv[1]) if len(sys.argv) > 1 else 1000) else 0)
@@ -1,88 +1,315 @@
-from transformers import PegasusTokenizer, PegasusForConditionalGeneration 
-import mysql.connector
+from transformers import PegasusTokenizerFast, PegasusForConditionalGeneration
+import torch
 import re
-from config.db_config import DB_CONFIG
+from db.connection import get_connection
+from db.body_store import load_bodies
+from db.canonical import store_summary
+from db.work_queue import claim, release, not_leased_sql, purge_expired
+from config.summarize_config import (
+    SUMMARY_PAGE_SIZE,
+    SUMMARY_BATCH_SIZE,
+    SUMMARY_TORCH_THREADS,
+    SUMMARY_QUANTIZE,
+    SUMMARY_BACKEND,
+    ONNX_MODEL_DIR,
+    SUMMARY_WORKERS,
+)
+from summarize import summarizer_client
+from summarize.chunking import chunk_article
+import os
+import sys
+import time
+
+LEASE_STAGE = "summarize_canonical"   # work_leases stage; item ids are canonical ids
+# Ids (of "{ids}") still needing a summary; claim() drops leases on the rest
+PENDING_SQL = (
+    "SELECT id FROM canonical_articles "
+    "WHERE id IN ({ids}) AND (summary IS NULL OR summary = '')"
+)
 
 # ------------------ Load Model ------------------
-def load_model(model_name="google/pegasus-cnn_dailymail"):
-    tokenizer = PegasusTokenizer.from_pretrained(model_name)
+def load_model(
+    model_name="google/pegasus-cnn_dailymail",
+    quantize=SUMMARY_QUANTIZE,
+    num_threads=SUMMARY_TORCH_THREADS,
+    backend=SUMMARY_BACKEND,
+):
+    """
+    Load the tokenizer and model for CPU inference.
+    quantize="int8" swaps the Linear layers for dynamically quantized int8
+    ones (smaller and usually faster on CPU, summaries differ slightly);
+    num_threads > 0 pins torch's intra-op thread count.
+    backend="onnx" loads an ONNX Runtime model instead (see load_onnx_model);
+    it has the same generate() API, so summarize_text works unchanged.
+    """
+    if quantize not in ("none", "int8"):
+        raise ValueError(f"unknown SUMMARY_QUANTIZE {quantize!r} (expected 'none' or 'int8')")
+    if backend not in ("torch", "onnx"):
+        raise ValueError(f"unknown SUMMARY_BACKEND {backend!r} (expected 'torch' or 'onnx')")
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+
+    # Fast (Rust) tokenizer: same vocabulary, much quicker batch encoding
+    tokenizer = PegasusTokenizerFast.from_pretrained(model_name)
+
+    if backend == "onnx":
+        if quantize != "none":
+            print("[WARN] SUMMARY_QUANTIZE only applies to the torch backend; ignored for onnx")
+        return tokenizer, load_onnx_model(model_name, num_threads)
+
     model = PegasusForConditionalGeneration.from_pretrained(model_name)
+    model.eval()
+
+    if quantize == "int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
     return tokenizer, model
 
+
+def load_onnx_model(model_name, num_threads=0):
+    """
+    Pegasus on ONNX Runtime's CPU provider. The encoder and decoder are
+    exported to ONNX on first use and saved under ONNX_MODEL_DIR; later
+    loads read the saved files and skip the export.
+    """
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        raise ImportError(
+            "SUMMARY_BACKEND=onnx needs optimum with onnxruntime "
+            "(pip install \"optimum[onnxruntime]\")"
+        ) from None
+
+    options = onnxruntime.SessionOptions()
+    if num_threads > 0:
+        options.intra_op_num_threads = num_threads
+
+    export_dir = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir) and os.listdir(export_dir):
+        return ORTModelForSeq2SeqLM.from_pretrained(
+            export_dir, provider="CPUExecutionProvider", session_options=options
+        )
+
+    print(f"[INFO] Exporting {model_name} to ONNX (first run only)...")
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_name, export=True, provider="CPUExecutionProvider", session_options=options
+    )
+    model.save_pretrained(export_dir)
+    print(f"[OK] ONNX model saved to {export_dir}")
+    return model
+
 # ------------------ Get Articles Without Summary ------------------
-def get_articles_to_summarize(conn):
+def iter_articles_to_summarize(conn, page_size=SUMMARY_PAGE_SIZE, start_after=0):
+    """
+    Yields (canonical_id, body_article_id) for canonical articles without a
+    summary, in id order, reading page_size rows at a time (keyset pagination
+    on id), so memory stays flat however large the backlog is. Each distinct
+    article is summarized once no matter how many hubs carry it.
+
+    Summarized rows drop out of the WHERE clause, so a restarted run picks up
+    where the last one stopped; start_after skips ahead explicitly.
+
+    Rows leased by another summarizer are skipped, but nothing is claimed
+    here: the caller claims each small group with claim_group right before
+    summarizing it, so leases never sit in a queue running down.
+    """
+    last_id = start_after
+    while True:
+        rows = fetch_pending_page(conn, last_id, page_size)
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield from rows
+
+
+def claim_group(conn, rows):
+    """
+    Lease a group of (canonical_id, body_article_id) and load their bodies.
+    Returns [(canonical_id, content)] for the rows this worker got; the
+    caller releases each lease once its summary is saved.
+    """
+    body_ids = dict(rows)
+    claimed = claim(conn, LEASE_STAGE, list(body_ids), pending_sql=PENDING_SQL)
+    bodies = load_bodies(conn, [body_ids[cid] for cid in claimed])
+    return [(cid, bodies.get(body_ids[cid])) for cid in claimed]
+
+
+def fetch_pending_page(conn, after_id, page_size=SUMMARY_PAGE_SIZE):
+    # (canonical_id, body_article_id) of the next page of unsummarized, unleased articles
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, content FROM articles 
-        WHERE content IS NOT NULL AND (summary IS NULL OR summary = '')
-    """)
-    return cursor.fetchall()
+    cursor.execute(f"""
+        SELECT c.id, c.body_article_id FROM canonical_articles c
+        WHERE c.id > %s AND c.body_article_id IS NOT NULL
+          AND (c.summary IS NULL OR c.summary = '')
+          AND {not_leased_sql(LEASE_STAGE, "c.id")}
+        ORDER BY c.id ASC
+        LIMIT %s
+    """, (after_id, int(time.time()), page_size))
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
 
 # ------------------ Summarize Text with Chunking & Cleanup ------------------
-def summarize_text(text, tokenizer, model):
-    max_len = tokenizer.model_max_length  # Usually 1024 for Pegasus
+GENERATE_KWARGS = dict(
+    max_length=225,
+    min_length=150,
+    length_penalty=2.0,
+    num_beams=4,
+    early_stopping=True,
+)
+
+
+def clean_chunk_summary(chunk_summary):
+    #  Clean Pegasus special tokens like <n>
+    chunk_summary = chunk_summary.replace("<n>", " ").strip()
+
+    #  Fix missing spaces between lowercase-uppercase 
+    chunk_summary = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', chunk_summary)
+
+    #  Fix missing spaces between letters & numbers
+    chunk_summary = re.sub(r'([a-zA-Z])([0-9])', r'\1 \2', chunk_summary)
+    chunk_summary = re.sub(r'([0-9])([a-zA-Z])', r'\1 \2', chunk_summary)
+    return chunk_summary
 
-    # Tokenize without truncation
-    inputs = tokenizer(text, return_tensors="pt", truncation=False, padding="longest")
-    input_ids = inputs["input_ids"][0]
 
-    # Split into chunks to avoid truncation
-    chunks = [input_ids[i:i + max_len] for i in range(0, len(input_ids), max_len)]
+def join_chunk_summaries(summaries):
+    # Combine summaries and remove extra spaces
+    final_summary = " ".join(summaries)
+    return re.sub(r'\s+', ' ', final_summary).strip()
+
+
+@torch.inference_mode()
+def summarize_text(text, tokenizer, model):
+    # Sentence-aligned chunks of at most model_max_length (usually 1024) tokens,
+    # from at most SUMMARY_TOKEN_BUDGET tokens of the article
+    chunks = chunk_article(text, tokenizer)
     summaries = []
 
     for chunk in chunks:
-        summary_ids = model.generate(
-            chunk.unsqueeze(0),
-            max_length=225,
-            min_length=150,
-            length_penalty=2.0,
-            num_beams=4,
-            early_stopping=True
-        )
+        summary_ids = model.generate(torch.tensor([chunk]), **GENERATE_KWARGS)
         chunk_summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        summaries.append(clean_chunk_summary(chunk_summary))
 
-        #  Clean Pegasus special tokens like <n>
-        chunk_summary = chunk_summary.replace("<n>", " ").strip()
+    return join_chunk_summaries(summaries)
 
-        #  Fix missing spaces between lowercase-uppercase 
-        chunk_summary = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', chunk_summary)
 
-        #  Fix missing spaces between letters & numbers
-        chunk_summary = re.sub(r'([a-zA-Z])([0-9])', r'\1 \2', chunk_summary)
-        chunk_summary = re.sub(r'([0-9])([a-zA-Z])', r'\1 \2', chunk_summary)
+@torch.inference_mode()
+def summarize_texts(texts, tokenizer, model, batch_size=SUMMARY_BATCH_SIZE):
+    """
+    Batched summarize_text for many articles at once. Every article is cut
+    into the same chunks summarize_text would use; the chunks of all articles
+    are sorted by length and run through model.generate batch_size at a
+    time, so each batch pads to similar lengths. Chunk summaries are then put
+    back in order and joined per article.
 
-        summaries.append(chunk_summary)
+    Returns one summary per text, in the same order.
+    """
+    texts = list(texts)
 
-    # Combine summaries and remove extra spaces
-    final_summary = " ".join(summaries)
-    final_summary = re.sub(r'\s+', ' ', final_summary).strip()
+    # (article index, chunk index, token ids)
+    chunks = []
+    for t, text in enumerate(texts):
+        for c, ids in enumerate(chunk_article(text, tokenizer)):
+            chunks.append((t, c, ids))
+    chunks.sort(key=lambda chunk: len(chunk[2]), reverse=True)
+
+    chunk_summaries = {}
+    for b in range(0, len(chunks), max(1, batch_size)):
+        batch = chunks[b:b + max(1, batch_size)]
+        inputs = tokenizer.pad({"input_ids": [ids for _, _, ids in batch]}, return_tensors="pt")
+        summary_ids = model.generate(
+            inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            **GENERATE_KWARGS
+        )
+        decoded = tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+        for (t, c, _), chunk_summary in zip(batch, decoded):
+            chunk_summaries[t, c] = clean_chunk_summary(chunk_summary)
 
-    return final_summary
+    summaries = [[] for _ in texts]
+    for t, c in sorted(chunk_summaries):
+        summaries[t].append(chunk_summaries[t, c])
+    return [join_chunk_summaries(parts) for parts in summaries]
 
 # ------------------ Update DB with Summary ------------------
-def update_summary(conn, article_id, summary):
-    cursor = conn.cursor()
-    cursor.execute("UPDATE articles SET summary = %s WHERE id = %s", (summary, article_id))
-    conn.commit()
+def update_summary(conn, canonical_id, summary):
+    # Saved once on the canonical article and copied to every hub's row
+    store_summary(conn, canonical_id, summary)
 
 # ------------------ Main Function ------------------
-def summarize_and_store_all_articles():
-    tokenizer, model = load_model()
-    conn = mysql.connector.connect(**DB_CONFIG)
+def summarize_and_store_all_articles(start_after=0):
+    # Housekeeping once per run: forget leases that expired long ago
+    conn = get_connection()
+    try:
+        purge_expired(conn)
+    finally:
+        conn.close()
+
+    if SUMMARY_WORKERS > 1:
+        # Imported here: summarize_pool imports this module
+        from summarize.summarize_pool import run_pool
+        return run_pool(SUMMARY_WORKERS, start_after=start_after)
+
+    # A running summarizer service already has the model loaded; use it if configured
+    client = summarizer_client.connect()
+    if client is not None:
+        summarize_many = client.summarize_texts
+    else:
+        tokenizer, model = load_model()
+        summarize_many = lambda texts: summarize_texts(texts, tokenizer, model)
 
+    conn = get_connection()
     try:
-        articles = get_articles_to_summarize(conn)
-        for article_id, content in articles:
-            try:
-                print(f" Summarizing article ID: {article_id}...")
-                summary = summarize_text(content, tokenizer, model)
-                update_summary(conn, article_id, summary)
-                print(f" Summary saved for article ID {article_id}")
-            except Exception as e:
-                print(f" Failed to summarize ID {article_id}: {e}")
+        group = []
+        for row in iter_articles_to_summarize(conn, start_after=start_after):
+            group.append(row)
+            if len(group) >= SUMMARY_BATCH_SIZE:
+                summarize_and_store_group(conn, claim_group(conn, group), summarize_many)
+                group = []
+        if group:
+            summarize_and_store_group(conn, claim_group(conn, group), summarize_many)
     finally:
         conn.close()
+        if client is not None:
+            client.close()
+
+
+def summarize_and_store_group(conn, group, summarize_many):
+    """
+    Summarize a group of (canonical_id, content) together, save each summary
+    and release its lease. Returns how many summaries were saved.
+    """
+    # Articles without a body can't be summarized; leave them for next time
+    for canonical_id, content in group:
+        if not content:
+            print(f" Failed to summarize canonical ID {canonical_id}: no article body")
+    group = [(cid, content) for cid, content in group if content]
+    if not group:
+        return 0
+
+    print(f" Summarizing canonical article IDs: {', '.join(str(cid) for cid, _ in group)}...")
+    try:
+        summaries = summarize_many([content for _, content in group])
+    except Exception as e:
+        # Redo one at a time so one bad article doesn't sink the whole batch
+        print(f" Batch failed ({e}); summarizing one at a time")
+        summaries = [None] * len(group)
+
+    saved = 0
+    for (canonical_id, content), summary in zip(group, summaries):
+        try:
+            if summary is None:
+                summary = summarize_many([content])[0]
+            update_summary(conn, canonical_id, summary)
+            release(conn, LEASE_STAGE, [canonical_id])
+            saved += 1
+            print(f" Summary saved for canonical article ID {canonical_id}")
+        except Exception as e:
+            print(f" Failed to summarize canonical ID {canonical_id}: {e}")
+    return saved
 
 # ------------------ Run Script ------------------
 if __name__ == "__main__":
-    summarize_and_store_all_articles()
+    # Optional: resume after a given canonical article id, e.g. --start-after 12345
+    start = int(sys.argv[sys.argv.index("--start-after") + 1]) if "--start-after" in sys.argv else 0
+    summarize_and_store_all_articles(start_after=start)
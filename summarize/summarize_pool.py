@@ -0,0 +1,155 @@
+"""
+Multi-process summarization: SUMMARY_WORKERS processes, each with its own
+model, split the CPU threads between them.
+
+    python -m summarize.summarize_pool [--workers N] [--start-after ID]
+
+The parent pages through the unsummarized canonical ids and feeds them into
+a shared queue. Each worker takes up to SUMMARY_BATCH_SIZE ids at a time,
+leases them (so it also plays well with summarizers on other machines),
+loads their bodies, summarizes and saves the results on its own DB
+connection. At the end the parent prints per-worker and aggregate
+throughput, for tuning workers x threads on each machine size.
+"""
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from config.summarize_config import SUMMARY_WORKERS, SUMMARY_TORCH_THREADS, SUMMARY_BATCH_SIZE
+from db.connection import get_connection
+from summarize.summarize_articles import (
+    load_model,
+    summarize_texts,
+    summarize_and_store_group,
+    fetch_pending_page,
+    claim_group,
+)
+
+
+def threads_per_worker(workers):
+    total = SUMMARY_TORCH_THREADS or os.cpu_count() or 1
+    return max(1, total // workers)
+
+
+def worker_main(index, threads, jobs, results):
+    started = time.perf_counter()
+    tokenizer, model = load_model(num_threads=threads)
+    results.put(("ready", index, time.perf_counter() - started))
+
+    summarize_many = lambda texts: summarize_texts(texts, tokenizer, model)
+    saved = seen = 0
+    busy = 0.0
+    conn = get_connection()
+    try:
+        done = False
+        while not done:
+            # Block for one id, then take whatever else is queued, up to a batch
+            batch = []
+            item = jobs.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= SUMMARY_BATCH_SIZE:
+                    break
+                try:
+                    item = jobs.get_nowait()
+                except queue.Empty:
+                    break
+            done = item is None
+            if not batch:
+                continue
+
+            t0 = time.perf_counter()
+            group = claim_group(conn, batch)
+            saved += summarize_and_store_group(conn, group, summarize_many)
+            seen += len(group)
+            busy += time.perf_counter() - t0
+    finally:
+        conn.close()
+        results.put(("done", index, saved, seen, busy))
+
+
+def put_while_alive(jobs, item, procs):
+    # A full queue with no live workers would block forever
+    while any(p.is_alive() for p in procs):
+        try:
+            jobs.put(item, timeout=5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pool(workers=SUMMARY_WORKERS, start_after=0):
+    workers = max(1, workers)
+    threads = threads_per_worker(workers)
+    print(f"[INFO] Summarizing with {workers} worker(s) x {threads} thread(s)")
+
+    # spawn, not fork: torch's thread pools don't survive a fork
+    ctx = multiprocessing.get_context("spawn")
+    jobs = ctx.Queue(maxsize=workers * SUMMARY_BATCH_SIZE * 2)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker_main, args=(i, threads, jobs, results), daemon=True)
+        for i in range(workers)
+    ]
+
+    started = time.perf_counter()
+    for p in procs:
+        p.start()
+
+    # Feed canonical ids; the bounded queue keeps us only a little ahead of the workers
+    queued = 0
+    conn = get_connection()
+    try:
+        last_id = start_after
+        feeding = True
+        while feeding:
+            rows = fetch_pending_page(conn, last_id)
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for row in rows:
+                feeding = put_while_alive(jobs, tuple(row), procs)
+                if not feeding:
+                    break
+                queued += 1
+    finally:
+        conn.close()
+        for _ in procs:
+            put_while_alive(jobs, None, procs)
+
+    # Workers that die (e.g. out of memory) never report; stop waiting once they're gone
+    stats = {}
+    while len(stats) < workers and (not results.empty() or any(p.is_alive() for p in procs)):
+        try:
+            message = results.get(timeout=5)
+        except queue.Empty:
+            continue
+        if message[0] == "ready":
+            print(f"[INFO] Worker {message[1]} loaded the model in {message[2]:.1f}s")
+        else:
+            stats[message[1]] = message[2:]
+
+    for p in procs:
+        p.join()
+    wall = time.perf_counter() - started
+
+    total_saved = sum(s[0] for s in stats.values())
+    for index, (saved, seen, busy) in sorted(stats.items()):
+        rate = saved * 60 / busy if busy else 0
+        print(f"  worker {index}: {saved}/{seen} saved, {rate:.1f} articles/min while busy")
+    if len(stats) < workers:
+        print(f"[WARN] {workers - len(stats)} worker(s) exited without reporting")
+    print(
+        f"[OK] {total_saved} summaries from {queued} queued article(s) in {wall:.1f}s "
+        f"({total_saved * 60 / wall:.1f} articles/min, {workers} x {threads} threads)"
+    )
+    return total_saved
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else SUMMARY_WORKERS
+    start = int(sys.argv[sys.argv.index("--start-after") + 1]) if "--start-after" in sys.argv else 0
+    run_pool(n, start_after=start)
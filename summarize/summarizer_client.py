@@ -0,0 +1,76 @@
+"""
+Client for the persistent summarizer service (summarize/summarizer_service.py).
+
+connect() returns a SummarizerClient when SUMMARY_SERVICE_ADDRESS is set, an
+authkey is configured and the service answers, otherwise None so the caller
+can load the model itself.
+
+The connection carries pickled objects, so it must never run without a
+secret: the key is SUMMARY_SERVICE_AUTHKEY, or else the one the service
+wrote to SUMMARY_SERVICE_KEY_FILE (same machine only).
+"""
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+from config.summarize_config import (
+    SUMMARY_SERVICE_ADDRESS,
+    SUMMARY_SERVICE_AUTHKEY,
+    SUMMARY_SERVICE_KEY_FILE,
+)
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def read_authkey():
+    # Configured secret first, then the service's key file; None if neither exists
+    if SUMMARY_SERVICE_AUTHKEY:
+        return SUMMARY_SERVICE_AUTHKEY.encode()
+    try:
+        with open(SUMMARY_SERVICE_KEY_FILE, "rb") as fh:
+            return fh.read().strip() or None
+    except OSError:
+        return None
+
+
+class SummarizerClient:
+    def __init__(self, authkey, address=SUMMARY_SERVICE_ADDRESS):
+        self.address = address
+        self._conn = Client(parse_address(address), authkey=authkey)
+
+    def _call(self, *request):
+        self._conn.send(request)
+        status, payload = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"summarizer service: {payload}")
+        return payload
+
+    def ping(self):
+        return self._call("ping")
+
+    def summarize_texts(self, texts):
+        # Same contract as summarize_articles.summarize_texts: one summary per text, in order
+        return self._call("summarize", list(texts))
+
+    def close(self):
+        self._conn.close()
+
+
+def connect():
+    if not SUMMARY_SERVICE_ADDRESS:
+        return None
+    authkey = read_authkey()
+    if authkey is None:
+        print(f"[WARN] SUMMARY_SERVICE_ADDRESS is set but no SUMMARY_SERVICE_AUTHKEY "
+              f"or {SUMMARY_SERVICE_KEY_FILE}; loading the model locally")
+        return None
+    try:
+        client = SummarizerClient(authkey)
+        model_name = client.ping()
+    except (OSError, EOFError, ValueError, AuthenticationError) as e:
+        print(f"[WARN] Summarizer service at {SUMMARY_SERVICE_ADDRESS} unavailable ({e}); loading the model locally")
+        return None
+    print(f"[INFO] Using summarizer service at {SUMMARY_SERVICE_ADDRESS} ({model_name})")
+    return client
@@ -0,0 +1,120 @@
+"""
+Long-lived summarizer: loads Pegasus once and serves summarize requests
+over a local socket, so short pipeline runs don't pay the model load.
+
+    python -m summarize.summarizer_service [--address 127.0.0.1:6100]
+
+Set SUMMARY_SERVICE_ADDRESS for the pipeline and
+summarize_and_store_all_articles sends its batches here.
+
+Requests are pickled, so anyone holding the authkey can run code as the
+service user. With SUMMARY_SERVICE_AUTHKEY unset the service generates a
+random key on start and writes it to SUMMARY_SERVICE_KEY_FILE (mode 0600)
+for clients on the same machine; serving other hosts needs an explicit
+SUMMARY_SERVICE_AUTHKEY on both sides.
+Each client gets its own thread; requests share the one model and run
+one at a time.
+"""
+import os
+import secrets
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+
+from config.summarize_config import (
+    SUMMARY_SERVICE_ADDRESS,
+    SUMMARY_SERVICE_AUTHKEY,
+    SUMMARY_SERVICE_KEY_FILE,
+)
+from summarize.summarize_articles import load_model, summarize_texts
+from summarize.summarizer_client import parse_address
+
+DEFAULT_ADDRESS = "127.0.0.1:6100"
+MODEL_NAME = "google/pegasus-cnn_dailymail"
+
+
+def handle_client(conn, tokenizer, model, model_lock):
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                return
+
+            command = request[0]
+            try:
+                if command == "ping":
+                    conn.send(("ok", MODEL_NAME))
+                elif command == "summarize":
+                    started = time.perf_counter()
+                    with model_lock:
+                        summaries = summarize_texts(request[1], tokenizer, model)
+                    print(f"[INFO] Summarized {len(summaries)} article(s) in {time.perf_counter() - started:.1f}s")
+                    conn.send(("ok", summaries))
+                else:
+                    conn.send(("error", f"unknown command {command!r}"))
+            except Exception as e:
+                print(f"[WARN] Request failed: {e}")
+                conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+def write_key_file(path=SUMMARY_SERVICE_KEY_FILE):
+    """
+    Generate a random authkey and write it to path, readable by this user
+    only. The file is created 0600 before the key goes in, then moved into
+    place, so the key is never readable by anyone else.
+    """
+    authkey = secrets.token_hex(32).encode()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(authkey)
+    os.replace(tmp, path)
+    print(f"[INFO] Wrote a new authkey to {path}")
+    return authkey
+
+
+def serve(address=None, authkey=SUMMARY_SERVICE_AUTHKEY):
+    address = address or SUMMARY_SERVICE_ADDRESS or DEFAULT_ADDRESS
+    host, _ = parse_address(address)
+
+    # Never listen without a secret: the protocol unpickles what it receives
+    if authkey:
+        authkey = authkey.encode()
+    elif host in ("127.0.0.1", "localhost", "::1"):
+        authkey = write_key_file()
+    else:
+        raise SystemExit(f"[ERROR] Listening on {host} needs an explicit SUMMARY_SERVICE_AUTHKEY")
+
+    started = time.perf_counter()
+    tokenizer, model = load_model(MODEL_NAME)
+    # Warm-up so the first real request doesn't pay for lazy initialisation
+    summarize_texts(["Warm-up sentence for the summarizer service."], tokenizer, model)
+    print(f"[INFO] Model loaded in {time.perf_counter() - started:.1f}s")
+
+    model_lock = threading.Lock()
+    with Listener(parse_address(address), authkey=authkey) as listener:
+        print(f"[OK] Summarizer service listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                # Failed handshake (wrong authkey, dropped connection); keep serving
+                print(f"[WARN] Rejected connection: {e}")
+                continue
+            threading.Thread(
+                target=handle_client, args=(conn, tokenizer, model, model_lock), daemon=True
+            ).start()
+
+
+if __name__ == "__main__":
+    addr = sys.argv[sys.argv.index("--address") + 1] if "--address" in sys.argv else None
+    try:
+        serve(addr)
+    except KeyboardInterrupt:
+        print("\n[INFO] Summarizer service stopped")